@@ -0,0 +1,74 @@
+"""Local index of emitted record contents, to skip records a re-sync finds unchanged."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import typing
+from hashlib import blake2b
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS record_hashes (
+    stream TEXT NOT NULL,
+    key TEXT NOT NULL,
+    hash BLOB NOT NULL,
+    PRIMARY KEY (stream, key)
+) WITHOUT ROWID
+"""
+
+
+def content_hash(record: dict) -> bytes:
+    """Return a 128-bit hash of a record's content, independent of its key order."""
+    return blake2b(json.dumps(record, sort_keys=True, default=str).encode(), digest_size=16).digest()
+
+
+class ChangeIndex:
+    """SQLite table of the content hash last emitted for every record, by stream and primary key.
+
+    The connection is opened on first use, by the thread writing records. Hashes are
+    committed when the tap writes a STATE message to stdout, and discarded when it is
+    closed without one, so they never cover records a failed sync did not deliver. The index assumes the
+    target loads everything the tap emits; delete the file to emit everything again.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Use the SQLite database at `path`, creating it if needed."""
+        self.path = path
+        self._connection: sqlite3.Connection | None = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Return the open connection."""
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+            self._connection.execute(SCHEMA)
+        return self._connection
+
+    def changed(self, stream_name: str, key: typing.Sequence[typing.Any], record: dict) -> bool:
+        """Record the record's content hash, returning whether it differs from the last one emitted."""
+        digest = content_hash(record)
+        key_text = json.dumps(list(key), default=str)
+        row = self.connection.execute(
+            "SELECT hash FROM record_hashes WHERE stream = ? AND key = ?", (stream_name, key_text),
+        ).fetchone()
+        if row is not None and row[0] == digest:
+            return False
+        self.connection.execute(
+            "INSERT INTO record_hashes (stream, key, hash) VALUES (?, ?, ?) "
+            "ON CONFLICT (stream, key) DO UPDATE SET hash = excluded.hash",
+            (stream_name, key_text, digest),
+        )
+        return True
+
+    def commit(self) -> None:
+        """Persist the hashes recorded so far."""
+        if self._connection is not None:
+            self._connection.commit()
+
+    def close(self) -> None:
+        """Close the connection, discarding hashes recorded since the last commit."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
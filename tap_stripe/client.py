@@ -2,29 +2,179 @@
 
 from __future__ import annotations
 
-import ast
 import csv
+import json
+import math
+import os
+import tempfile
+import threading
 import time
 import typing
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from datetime import datetime
-from hashlib import md5
-from io import StringIO
+from hashlib import sha256
+from itertools import islice
 from typing import Any, Iterable
+from urllib.parse import urlsplit
 
+import requests
 from requests.auth import HTTPBasicAuth
+from singer_sdk import _singerlib as singer
+from singer_sdk.exceptions import FatalAPIError
+from singer_sdk.helpers._typing import TypeConformanceLevel, _warn_unmapped_properties
+from singer_sdk.helpers._util import utc_now
+from singer_sdk.helpers.jsonpath import extract_jsonpath
+from singer_sdk.pagination import BaseAPIPaginator
 from singer_sdk.streams import RESTStream
 
+from tap_stripe import reports
+from tap_stripe.concurrency import PartitionPrefetcher
+from tap_stripe.conform import compile_conformer
+from tap_stripe.dedup import SeenKeys
+from tap_stripe.metrics import (
+    LatencyWindow,
+    PartitionMetrics,
+    Section,
+    StreamMetrics,
+    write_prometheus_textfile,
+)
+from tap_stripe.planning import StreamPlan, describe_layout, sample
+from tap_stripe.profiling import SectionTimers
+from tap_stripe.sharding import DEFAULT_WINDOW_DAYS, created_windows
+
 if typing.TYPE_CHECKING:
+    from concurrent.futures import Future
+
     from singer_sdk._singerlib import Schema
     from singer_sdk.tap_base import Tap
 
 T = typing.TypeVar("T")
 TPageToken = typing.TypeVar("TPageToken")
 
+SPOOL_BLOCK_BYTES = 1024 * 1024
+HEDGE_WORKERS = 32
+GENERATED_COLUMNS = ("report_start_at", "report_end_at", "loaded_at", "account_id")
+FAILED_RUN_STATUSES = ("failed", "canceled")
+# Report runs polled per partition and sync; a run issued after the last failure is polled by the next sync.
+REPORT_RUN_ATTEMPTS = 2
+
+
+@dataclass(frozen=True)
+class StateUpdate:
+    """Keys to set in a partition's state, yielded among the records so the thread writing messages applies them.
+
+    A value of None removes the key.
+    """
+
+    values: dict[str, Any]
+
+
+class ReportRunFailedError(Exception):
+    """A report run failed, was canceled, or is unknown to Stripe."""
+
+
+def page_payload(response: requests.Response) -> dict:
+    """Return the decoded JSON body of a page, decoding it only once for the stream and its paginator."""
+    payload = getattr(response, "stripe_payload", None)
+    if payload is None:
+        payload = response.json()
+        response.stripe_payload = payload  # type: ignore[attr-defined]
+    return payload
+
+
+class StripePaginator(BaseAPIPaginator[typing.Optional[str]]):
+    """Paginate list endpoints with the id of the last object, until Stripe reports `has_more: false`.
+
+    This saves the request for the empty page that would otherwise end every listing,
+    which matters for streams split into many small windows.
+    """
+
+    def __init__(self) -> None:
+        """Start at the first page."""
+        super().__init__(None)
+        self._payload: dict = {}
+
+    def has_more(self, response: requests.Response) -> bool:  # noqa: D102
+        self._payload = page_payload(response)
+        return bool(self._payload.get("has_more"))
+
+    def get_next(self, response: requests.Response) -> str | None:  # noqa: ARG002, D102
+        data = self._payload.get("data") or []
+        return data[-1]["id"] if data else None
+
+
+class StripeSearchPaginator(StripePaginator):
+    """Paginate Search API results with the `next_page` cursor Stripe returns."""
+
+    def get_next(self, response: requests.Response) -> str | None:  # noqa: ARG002, D102
+        return self._payload.get("next_page")
+
+
+def _close_response(future: Future[requests.Response]) -> None:
+    """Release the connection of a response nobody is waiting for any more."""
+    if future.exception() is None:
+        future.result().close()
+
+
+def to_timestamp(value: str) -> int:
+    """Convert a `start_date` setting to a Unix timestamp."""
+    return int(datetime.timestamp(datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")))  # noqa: DTZ007
+
 
 class StripeStream(RESTStream):
     """Stripe stream class."""
 
+    profiled_sections: typing.ClassVar[tuple[str, ...]] = ("parse_response", "post_process")
+    window_days: typing.ClassVar[int | None] = None
+    page_size: typing.ClassVar[int] = 100
+    prefetches_pages: typing.ClassVar[bool] = True
+    resumes_mid_partition: typing.ClassVar[bool] = True
+    # How long after a window ends objects created in it may still be missing from a listing.
+    window_settle_seconds: typing.ClassVar[int] = 300
+    # Whether re-synced records can match their last content, i.e. carry no per-run fields.
+    uses_change_index: typing.ClassVar[bool] = True
+
+    def __init__(  # noqa: D107
+        self, tap: Tap, name: str | None = None, schema: dict[str, Any] | Schema | None = None, path: str | None = None,
+    ) -> None:
+        super().__init__(tap, name, schema, path)
+        self.performance_metrics = StreamMetrics(self.name)
+        self.latencies = LatencyWindow()
+        self._hedge_pool: ThreadPoolExecutor | None = None
+        self._hedge_pool_lock = threading.Lock()
+        self._local = threading.local()
+        self._prefetcher: PartitionPrefetcher | None = None
+        self.section_timers = SectionTimers()
+        self.seen_keys = SeenKeys() if self.config.get("deduplicate") else None
+        self.duplicates_dropped = 0
+        self.unchanged_records = 0
+        self._conformer: typing.Callable[[dict], tuple[dict, list[str]]] | None = None
+        if self.config.get("profile_sections"):
+            self.section_timers.instrument(self, self.profiled_sections)
+        if self.config.get("accounts"):
+            schema = self.schema
+            self._schema = {**schema, "properties": {**schema["properties"], "account_id": {"type": ["string", "null"]}}}
+            self.primary_keys = [*self.primary_keys, "account_id"]
+
+    @property
+    def _partition_context(self) -> dict | None:
+        """The partition the current thread is fetching."""
+        return getattr(self._local, "context", None)
+
+    @_partition_context.setter
+    def _partition_context(self, context: dict | None) -> None:
+        self._local.context = context
+        self._local.metrics = None
+
+    @property
+    def _partition_metrics(self) -> PartitionMetrics:
+        """The measurements of the partition the current thread is fetching, looked up once per partition."""
+        partition = getattr(self._local, "metrics", None)
+        if partition is None:
+            partition = self._local.metrics = self.performance_metrics.partition(self._partition_context)
+        return partition
+
     @property
     def url_base(self) -> str:
         """Return the API URL root, configurable via tap settings."""
@@ -33,32 +183,587 @@ class StripeStream(RESTStream):
     records_jsonpath = "$.data[*]"  # Or override `parse_response`.
     next_page_token_jsonpath = "$.data[-1].id"  # noqa: S105
 
+    def get_new_paginator(self) -> StripePaginator:
+        """Return a paginator that stops on `has_more: false`."""
+        return StripePaginator()
+
+    @property
+    def partitions(self) -> list[dict] | None:
+        """Return the partitions this shard syncs, each with its own state.
+
+        There is one partition per configured account and, for windowed streams, per
+        `created` window (per account, if there are accounts). With several shards,
+        accounts are split between shards if there are any, else windows are. Windows
+        that are closed in the state are left out.
+        """
+        shard = self._tap.shard
+        accounts = [
+            {"account_id": account["id"]} for account in self.config.get("accounts") or [] if shard.owns(account["id"])
+        ]
+        windows = self.created_windows()
+        partitions_state = self.stream_state.get("partitions", [])
+        closed = [partition["context"] for partition in partitions_state if partition.get("closed")]
+        if accounts:
+            if not windows:
+                return accounts
+            partitions = [{**account, **window} for account in accounts for window in windows]
+            return [partition for partition in partitions if partition not in closed]
+        if windows:
+            return [window for index, window in enumerate(windows) if shard.owns_window(index) and window not in closed]
+        if self.config.get("accounts"):
+            return []
+        return None
+
+    def created_windows(self) -> list[dict]:
+        """Return the `created` windows from `start_date` until now, if the stream is split into windows.
+
+        The `window_days` setting applies to all list streams; otherwise high-volume
+        streams use their own `window_days`, and sharding uses the default size.
+        """
+        if self.replication_key != "created" or not self.config.get("start_date"):
+            return []
+        days = self.config.get("window_days") or self.window_days
+        if not days and self._tap.shard.count > 1 and not self.config.get("accounts"):
+            days = DEFAULT_WINDOW_DAYS
+        if not days:
+            return []
+        return created_windows(to_timestamp(self.config["start_date"]), int(time.time()), days)
+
+    def in_shard(self, context: dict | None) -> bool:
+        """Whether this shard syncs the partition, or the unpartitioned stream if `context` is None."""
+        if context is not None:
+            return True
+        partitions = self.partitions
+        return partitions is None and self._tap.shard.owns(self.name)
+
+    def _account(self) -> dict | None:
+        """Return the config of the account the current thread is fetching, if any."""
+        context = self._partition_context
+        if not context or "account_id" not in context:
+            return None
+        return next(account for account in self.config["accounts"] if account["id"] == context["account_id"])
+
     @property
     def authenticator(self) -> HTTPBasicAuth:
-        """Return the authenticator."""
-        return HTTPBasicAuth(username=self.config.get("api_key"), password="")
+        """Return the authenticator, using the current account's own key if it has one."""
+        account = self._account()
+        api_key = account.get("api_key") if account else None
+        return HTTPBasicAuth(username=api_key or self.config.get("api_key"), password="")
+
+    @property
+    def http_headers(self) -> dict:
+        """Return the HTTP headers, acting on behalf of the current connected account if it has no own key."""
+        account = self._account()
+        if account and not account.get("api_key"):
+            return {**super().http_headers, "Stripe-Account": account["id"]}
+        return super().http_headers
+
+    def build_prepared_request(self, *args: typing.Any, **kwargs: typing.Any) -> requests.PreparedRequest:
+        """Build an authenticated request without setting the auth on the shared session."""
+        return self.requests_session.prepare_request(requests.Request(*args, auth=self.authenticator, **kwargs))
 
     def get_url_params(self, context:dict, next_page_token:str) -> dict:
         """Get URL parameters."""
-        params = {"limit": 100}
+        params = {"limit": self.page_size}
         start_date = self.get_starting_replication_key_value(context)
 
         if start_date:
             if type(start_date) is str:
-                start_date = int(datetime.timestamp(datetime.strptime(start_date, "%Y-%m-%dT%H:%M:%SZ")))  # noqa: DTZ007
+                start_date = to_timestamp(start_date)
             params["created[gt]"] = start_date
 
+        if context and "created_lt" in context:
+            if not start_date or start_date < context["created_gte"]:
+                params.pop("created[gt]", None)
+                params["created[gte]"] = context["created_gte"]
+            params["created[lt]"] = context["created_lt"]
+
         if next_page_token:
             params["starting_after"] = next_page_token
+        elif "resume" in self.get_context_state(context):
+            params["starting_after"] = self.get_context_state(context)["resume"]["starting_after"]
 
         return params
 
+    def _request(
+        self, prepared_request: requests.PreparedRequest, context: dict | None, *, stream: bool = False,
+    ) -> requests.Response:
+        """Send a request, recording its latency and size in the performance metrics.
+
+        With `stream`, the body is left unread for the caller to iterate, and only a
+        `Content-Length` header counts towards the downloaded bytes.
+        """
+        self._tap.rate_limiter.acquire()
+        endpoint = urlsplit(prepared_request.url).path
+        started = time.perf_counter()
+        if stream or prepared_request.method != "GET" or not self.config.get("hedge_percentile"):
+            response = self._send(prepared_request, stream=stream)
+        else:
+            response = self._send_hedged(prepared_request, endpoint, context)
+        seconds = time.perf_counter() - started
+        self.latencies.observe(endpoint, seconds)
+        content_length = response.headers.get("Content-Length")
+        self.performance_metrics.observe_request(
+            endpoint=endpoint,
+            seconds=seconds,
+            size=int(content_length) if content_length else (0 if stream else len(response.content)),
+            context=context,
+        )
+        self._write_request_duration_log(endpoint=self.path, response=response, context=context, extra_tags=None)
+        self.validate_response(response)
+        return response
+
+    def _send(self, prepared_request: requests.PreparedRequest, *, stream: bool = False) -> requests.Response:
+        return self.requests_session.send(
+            prepared_request, timeout=self.timeout, allow_redirects=self.allow_redirects, stream=stream,
+        )
+
+    def _send_hedged(
+        self, prepared_request: requests.PreparedRequest, endpoint: str, context: dict | None,
+    ) -> requests.Response:
+        """Send a GET, and a duplicate of it if it is slower than `hedge_percentile` of the endpoint's recent requests.
+
+        The duplicate is only sent if the shared rate budget has a token to spare right
+        away. Whichever copy succeeds first is returned; the other is closed when it ends.
+        """
+        threshold = self.latencies.percentile(endpoint, self.config["hedge_percentile"])
+        if threshold is None:
+            return self._send(prepared_request)
+        with self._hedge_pool_lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="tap-stripe-hedge")
+        pending = {self._hedge_pool.submit(self._send, prepared_request)}
+        done, _ = wait(pending, timeout=threshold)
+        if not done and self._tap.rate_limiter.try_acquire():
+            self.performance_metrics.observe_hedge(context)
+            pending.add(self._hedge_pool.submit(self._send, prepared_request.copy()))
+        error: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.add_done_callback(_close_response)
+                    return future.result()
+                error = error or future.exception()
+        raise typing.cast("BaseException", error)
+
+    def parse_response(self, response: requests.Response) -> Iterable[dict]:
+        """Parse a page of records, timing the decoding."""
+        with self.performance_metrics.time(Section.PARSE, self._partition_context):
+            records = list(extract_jsonpath(self.records_jsonpath, input=page_payload(response)))
+        self.performance_metrics.observe_page(self._partition_context)
+        yield from records
+
+    def get_records(self, context: dict | None) -> Iterable[dict[str, Any]]:
+        """Get records, timing the partition's wall time.
+
+        When the stream has several partitions and `account_concurrency` allows it,
+        the first call starts fetching this and all following partitions on worker
+        threads; records and state are still emitted one partition at a time. With
+        `deduplicate`, records whose primary key was already emitted are dropped. Once
+        `max_runtime` is reached, the partition is paused and later ones are skipped.
+        """
+        if self._tap.runtime_exceeded():
+            self.logger.info("Skipping partition %s of %s, max_runtime was reached", context, self.name)
+            self._stop_prefetch()
+            return
+        listed_at = int(time.time())
+        records = self._checkpointed(self._get_records(context), context)
+        if self.seen_keys is None:
+            yield from records
+        else:
+            for record in records:
+                if isinstance(record, dict) and not self.seen_keys.add(self._primary_key_values(record, context)):
+                    self.duplicates_dropped += 1
+                    continue
+                yield record
+        self._close_window(context, listed_at)
+
+    def _close_window(self, context: dict | None, listed_at: int) -> None:
+        """Mark a `created` window that had ended when it was listed in full as closed.
+
+        Stripe sets `created` once, when an object is created, so such a window cannot
+        get new objects, and later syncs leave it out of the partitions.
+        """
+        if not context or "created_lt" not in context:
+            return
+        state = self.get_context_state(context)
+        if "resume" not in state and context["created_lt"] + self.window_settle_seconds <= listed_at:
+            state["closed"] = True
+
+    def _checkpointed(self, records: typing.Generator[Any, None, None], context: dict | None) -> Iterable[Any]:
+        """Yield records until `max_runtime` is reached, then pause the partition after the last record's cursor.
+
+        The bookmark stays where it was, and `resume` in the partition's state keeps the
+        cursor to list on from and the highest replication key value seen so far, which
+        becomes the bookmark once a later sync completes the partition.
+        """
+        if not self.resumes_mid_partition or not self.config.get("max_runtime"):
+            yield from records
+            return
+        cursor = None
+        for record in records:
+            if isinstance(record, dict):
+                record_cursor = self._resume_cursor(record)
+                if cursor is not None and record_cursor != cursor and self._tap.runtime_exceeded():
+                    records.close()
+                    resume = {"starting_after": cursor, "replication_key_value": self._high_water(context)}
+                    self._pause(context, {"resume": resume})
+                    return
+                cursor = record_cursor
+            yield record
+        self._complete_resume(context)
+
+    def _resume_cursor(self, record: dict) -> str:
+        """Return the id the listing can continue after once this record is written."""
+        return record["id"]
+
+    def _high_water(self, context: dict | None) -> Any:  # noqa: ANN401
+        """Return the highest replication key value seen in the partition, including by paused syncs."""
+        state = self.get_context_state(context)
+        values = [
+            state.get("progress_markers", {}).get("replication_key_value"),
+            state.get("resume", {}).get("replication_key_value"),
+        ]
+        return max((value for value in values if value is not None), default=None)
+
+    def _pause(self, context: dict | None, values: dict[str, Any]) -> None:
+        """Stop the partition without advancing its bookmark, storing `values` to resume from."""
+        self.get_context_state(context).pop("progress_markers", None)
+        self._update_state(context, values)
+        self.logger.info("Paused %s at %s, max_runtime was reached", self.name, values)
+
+    def _complete_resume(self, context: dict | None) -> None:
+        """Let a partition finished after being paused bookmark the highest value seen by all its syncs."""
+        state = self.get_context_state(context)
+        if "resume" not in state:
+            return
+        high_water = self._high_water(context)
+        del state["resume"]
+        if self.replication_key and high_water is not None:
+            markers = state.setdefault("progress_markers", {})
+            markers.update(replication_key=self.replication_key, replication_key_value=high_water)
+
+    def _update_state(self, context: dict | None, values: dict[str, Any]) -> None:
+        """Set keys in a partition's state and write it; a value of None removes the key."""
+        state = self.get_context_state(context)
+        for key, value in values.items():
+            if value is None:
+                state.pop(key, None)
+            else:
+                state[key] = value
+        self._is_state_flushed = False
+        self._write_state_message()
+
+    def _primary_key_values(self, record: dict, context: dict | None) -> list:
+        """Return the record's primary key, taking keys the SDK adds later, like `account_id`, from the context."""
+        context = context or {}
+        return [record[key] if key in record else context.get(key) for key in self.primary_keys]
+
+    def _get_records(self, context: dict | None) -> typing.Generator[Any, None, None]:
+        self._partition_context = context
+        if not self.in_shard(context):
+            self.logger.info("Skipping stream %s, it is synced by another shard", self.name)
+            return
+        with self.performance_metrics.time(None, context):
+            if self._prefetcher is None and context:
+                self._start_prefetch(context)
+            if self._prefetcher is None or context not in self._prefetcher:
+                yield from self._prefetch_pages(context)
+                return
+            try:
+                yield from self._prefetcher.records(context)
+            except BaseException:
+                self._stop_prefetch()
+                raise
+            if self._prefetcher.exhausted:
+                self._stop_prefetch()
+
+    def _prefetch_pages(self, context: dict | None) -> Iterable[dict[str, Any]]:
+        """Fetch a partition on a background thread, up to `prefetch_pages` pages ahead of the records being written.
+
+        The next page is requested as soon as the current one is decoded, so its network
+        round trip overlaps with conforming and writing the current page.
+        """
+        pages = self.config.get("prefetch_pages", 0) if self.prefetches_pages else 0
+        if pages <= 0:
+            yield from self._fetch_partition(context)
+            return
+        prefetcher = PartitionPrefetcher(self._fetch_partition, [context], max_workers=1, buffer_size=pages * self.page_size)
+        try:
+            yield from prefetcher.records(context)
+        finally:
+            prefetcher.close()
+
+    def _start_prefetch(self, context: dict) -> None:
+        partitions = self.partitions or []
+        concurrency = self.config.get("account_concurrency", 1)
+        if context not in partitions or concurrency <= 1 or len(partitions) < 2:  # noqa: PLR2004
+            return
+        pending = partitions[partitions.index(context) :]
+        for partition in pending:
+            self._write_starting_replication_value(partition)
+        self._prefetcher = PartitionPrefetcher(self._fetch_partition, pending, max_workers=concurrency)
+
+    def _stop_prefetch(self) -> None:
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+            self._prefetcher = None
+
+    def _fetch_partition(self, context: dict | None) -> Iterable[dict[str, Any]]:
+        """Fetch the records of one partition, on the calling thread."""
+        self._partition_context = context
+        return self._get_partition_records(context)
+
+    def _get_partition_records(self, context: dict | None) -> Iterable[dict[str, Any]]:
+        return super().get_records(context)
+
+    def _generate_record_messages(self, record: dict) -> Iterable[singer.RecordMessage]:
+        """Generate RECORD messages, conforming the record with a function compiled from the schema and selection once.
+
+        With a `change_index_path`, records whose content is the same as when they were
+        last emitted are skipped, in streams whose records have no per-run fields.
+        """
+        if self.TYPE_CONFORMANCE_LEVEL != TypeConformanceLevel.RECURSIVE:
+            yield from super()._generate_record_messages(record)
+            return
+        if self._conformer is None:
+            self._conformer = compile_conformer(self.schema, self.mask)
+        record, unmapped = self._conformer(record)
+        if unmapped:
+            _warn_unmapped_properties(self.name, tuple(unmapped), self.logger)
+        change_index = self._tap.change_index if self.uses_change_index and self.primary_keys else None
+        if change_index is not None and not change_index.changed(
+            self.name, self._primary_key_values(record, None), record,
+        ):
+            self.unchanged_records += 1
+            return
+        for stream_map in self.stream_maps:
+            mapped_record = stream_map.transform(record)
+            if mapped_record is not None:
+                yield singer.RecordMessage(
+                    stream=stream_map.stream_alias, record=mapped_record, version=None, time_extracted=utc_now(),
+                )
+
+    def plan(self) -> StreamPlan:
+        """Estimate the cost of syncing this stream from the first page of a few sampled partitions.
+
+        A partition whose first page is its last is counted exactly. Otherwise its size
+        is extrapolated from the `created` density of that page over the partition's
+        time range. The sampled partitions are scaled up to all partitions.
+        """
+        partitions = self.partitions
+        if partitions is None and not self.in_shard(None):
+            return StreamPlan(self.name, describe_layout([]))
+        contexts: list[dict | None] = [None] if partitions is None else list(partitions)
+        plan = StreamPlan(self.name, describe_layout(partitions), partitions=len(contexts))
+        if not contexts:
+            return plan
+        probes = [self._probe(context) for context in sample(contexts)]
+        scale = len(contexts) / len(probes)
+        plan.records = round(sum(records for records, _, _ in probes) * scale)
+        plan.bytes = round(sum(size for _, size, _ in probes) * scale)
+        plan.requests = math.ceil(sum(requests for _, _, requests in probes) * scale)
+        plan.concurrency = min(len(contexts), max(1, self.config.get("account_concurrency", 1)))
+        plan.latency = self._mean_latency()
+        return plan
+
+    def _mean_latency(self) -> float:
+        """Return the mean latency of the requests this stream made so far."""
+        histograms = self.performance_metrics.total().latency.values()
+        requests = sum(histogram.count for histogram in histograms)
+        return sum(histogram.total for histogram in histograms) / max(1, requests)
+
+    def _probe(self, context: dict | None) -> tuple[float, float, float]:
+        """Request the first page of a partition, returning its estimated records, bytes and requests."""
+        self._partition_context = context
+        self._write_starting_replication_value(context)
+        response = self.request_decorator(self._request)(self.prepare_request(context, next_page_token=None), context)
+        payload = response.json()
+        data = payload.get("data") or []
+        records = float(len(data))
+        created = [obj["created"] for obj in data if isinstance(obj.get("created"), int)]
+        lower = self._created_lower_bound(context)
+        if payload.get("has_more") and len(created) > 1 and max(created) > min(created) and lower is not None:
+            # Lists are newest first, so the rest of the partition lies between its lower bound and this page.
+            records = len(data) * (max(created) - lower) / (max(created) - min(created))
+        pages = max(1.0, math.ceil(records / self.page_size))
+        size = len(response.content) * records / len(data) if data else float(len(response.content))
+        records_per_object, requests_per_object = self._page_factors(data)
+        return records * records_per_object, size, pages + records * requests_per_object
+
+    def _created_lower_bound(self, context: dict | None) -> int | None:
+        """Return the earliest `created` a partition syncs, from its bookmark, start date or window."""
+        lower = self.get_starting_replication_key_value(context)
+        if isinstance(lower, str):
+            lower = to_timestamp(lower)
+        if context and "created_gte" in context:
+            lower = max(lower or 0, context["created_gte"])
+        return lower
+
+    def _page_factors(self, page: list[dict]) -> tuple[float, float]:  # noqa: ARG002
+        """Return the records each listed object yields and the requests it takes besides list pages."""
+        return 1.0, 0.0
+
+    def _write_record_message(self, record: dict) -> None:
+        started = time.perf_counter()
+        super()._write_record_message(record)
+        self.performance_metrics.observe_record(self._partition_metrics, time.perf_counter() - started)
+
+    def sync(self, context: dict | None = None) -> None:
+        """Sync the stream, then update the Prometheus textfile if configured."""
+        super().sync(context)
+        textfile = self.config.get("metrics_textfile")
+        if textfile:
+            write_prometheus_textfile(
+                textfile,
+                [stream.performance_metrics for stream in self._tap.streams.values() if isinstance(stream, StripeStream)],
+            )
+
+    def log_sync_costs(self) -> None:
+        """Log the sync costs and performance metrics."""
+        super().log_sync_costs()
+        self.performance_metrics.log(self.metrics_logger)
+        self.section_timers.log(self.logger, self.name)
+        if self.seen_keys is not None:
+            self.logger.info(
+                "Dropped %d duplicate records of %s, tracking %d keys", self.duplicates_dropped, self.name, len(self.seen_keys),
+            )
+        if self._tap.change_index is not None and self.uses_change_index:
+            self.logger.info("Skipped %d unchanged records of %s", self.unchanged_records, self.name)
+
+
+class StripeSearchStream(StripeStream):
+    """Base class for objects synced through the Search API, `/v1/<object>/search`.
+
+    The bookmark and any `created` window become a search query such as
+    `created>1704067200`, so objects whose list endpoint cannot filter on `created`
+    still sync incrementally. Search results are indexed up to a minute after the
+    object is written, so objects newer than `SEARCH_LAG_SECONDS` are left for the
+    next run instead of being bookmarked past before they are searchable.
+    """
+
+    SEARCH_LAG_SECONDS = 60
+    is_sorted = False
+    resumes_mid_partition = False
+    window_settle_seconds = SEARCH_LAG_SECONDS
+
+    def get_url(self, context: dict | None) -> str:
+        """Return the search endpoint of the object's list path."""
+        return f"{super().get_url(context)}/search"
+
+    def get_new_paginator(self) -> StripeSearchPaginator:
+        """Return a paginator following `next_page`."""
+        return StripeSearchPaginator()
+
+    def get_url_params(self, context: dict, next_page_token: str) -> dict:
+        """Get URL parameters, with the `created` bounds as a search query."""
+        params: dict[str, Any] = {"limit": self.page_size}
+        start_date = self.get_starting_replication_key_value(context)
+        if type(start_date) is str:
+            start_date = to_timestamp(start_date)
+        end = int(time.time()) - self.SEARCH_LAG_SECONDS
+        clauses = []
+        if context and "created_lt" in context:
+            if not start_date or start_date < context["created_gte"]:
+                clauses.append(f"created>={context['created_gte']}")
+                start_date = None
+            end = min(end, context["created_lt"])
+        if start_date:
+            clauses.append(f"created>{start_date}")
+        clauses.append(f"created<{end}")
+        params["query"] = " AND ".join(clauses)
+        if next_page_token:
+            params["page"] = next_page_token
+        return params
+
+
+class StripeSubresourceStream(StripeStream):
+    """Base class for sub-resources that Stripe only lists per parent, e.g. checkout session line items.
+
+    Rather than syncing a child stream per parent record, parents are listed with the
+    sub-resource expanded, which embeds its first page. Only parents whose embedded list
+    has more items are fetched separately, concurrently per page of parents, so the
+    request count grows with pages rather than with parents. Every record gets the
+    parent id as `parent_key` and the parent's `created` as `<parent_key>_created`,
+    which subclasses use as the replication key.
+    """
+
+    parent_path: typing.ClassVar[str]
+    parent_key: typing.ClassVar[str]
+    subresource: typing.ClassVar[str]
+    fanout_workers: typing.ClassVar[int] = 4
+    is_sorted = False
+
+    def __init__(  # noqa: D107
+        self, tap: Tap, name: str | None = None, schema: dict[str, Any] | Schema | None = None, path: str | None = None,
+    ) -> None:
+        super().__init__(tap, name, schema, path or self.parent_path)
+
+    def get_url_params(self, context: dict, next_page_token: str) -> dict:
+        """List parents with the sub-resource expanded."""
+        params = super().get_url_params(context, next_page_token)
+        params["expand[]"] = [f"data.{self.subresource}"]
+        return params
+
+    def parse_response(self, response: requests.Response) -> Iterable[dict]:
+        """Yield the sub-resource records of a page of parents, fetching the rest of long lists concurrently."""
+        with self.performance_metrics.time(Section.PARSE, self._partition_context):
+            parents = page_payload(response)["data"]
+        self.performance_metrics.observe_page(self._partition_context)
+        context = self._partition_context
+        truncated = [parent for parent in parents if (parent.get(self.subresource) or {}).get("has_more")]
+        remaining: dict[str, list[dict]] = {}
+        if truncated:
+            with ThreadPoolExecutor(max_workers=self.fanout_workers, thread_name_prefix="tap-stripe-fanout") as pool:
+                pages = pool.map(lambda parent: self._fetch_remaining(parent, context), truncated)
+                remaining = dict(zip([parent["id"] for parent in truncated], pages))
+        created_key = f"{self.parent_key}_created"
+        for parent in parents:
+            embedded = (parent.get(self.subresource) or {}).get("data") or []
+            for record in [*embedded, *remaining.get(parent["id"], [])]:
+                yield {**record, self.parent_key: parent["id"], created_key: parent["created"]}
+
+    def _resume_cursor(self, record: dict) -> str:
+        """Return the parent id, so a paused sync continues after the last parent whose records were all written."""
+        return record[self.parent_key]
+
+    def _page_factors(self, page: list[dict]) -> tuple[float, float]:
+        """Return the embedded records per parent, and the share of parents whose list needs its own requests."""
+        if not page:
+            return 0.0, 0.0
+        embedded = [parent.get(self.subresource) or {} for parent in page]
+        records = sum(len(items.get("data") or []) for items in embedded)
+        truncated = sum(1 for items in embedded if items.get("has_more"))
+        return records / len(page), truncated / len(page)
+
+    def _fetch_remaining(self, parent: dict, context: dict | None) -> list[dict]:
+        """Page through a parent's sub-resource after its embedded first page."""
+        self._partition_context = context
+        records: list[dict] = []
+        starting_after = parent[self.subresource]["data"][-1]["id"]
+        url = f"{self.url_base}{self.parent_path}/{parent['id']}/{self.subresource}"
+        while starting_after:
+            prepared_request = self.build_prepared_request(
+                method="GET", url=url, headers=self.http_headers, params={"limit": self.page_size, "starting_after": starting_after},
+            )
+            page = self.request_decorator(self._request)(prepared_request, context).json()
+            records.extend(page["data"])
+            starting_after = page["data"][-1]["id"] if page["data"] and page.get("has_more") else None
+        return records
+
 
 class StripeReportStream(StripeStream):
     """Stripe report stream class."""
 
     path = ""
     replication_key = "report_end_at"
+    profiled_sections = ("download_report", "post_process")
+    # Rows are read from a downloaded file, there is no next page to request.
+    prefetches_pages = False
+    # Every row carries the interval and `loaded_at` of its run.
+    uses_change_index = False
 
     def __init__(  # noqa: D107
         self, tap: Tap, name: str | None = None, schema: dict[str, Any] | Schema | None = None, path: str | None = None,
@@ -72,17 +777,54 @@ class StripeReportStream(StripeStream):
         return "https://api.stripe.com/v1/reporting"
 
     def retrieve_report_data_availability(self) -> tuple[int, int]:
-        """Get the data availability for the report."""
+        """Get the data availability for the report.
+
+        All report types of an account are fetched in one request and cached on the tap
+        for a few minutes, so every report stream of a sync sees the same horizon.
+        """
+        account = self._account()
+        report_types = self._tap.report_types.get(account["id"] if account else None, self.retrieve_report_types)
+        response = report_types.get(self.original_name)
+        if response is None:
+            prepared_request = self.build_prepared_request(
+                method="GET",
+                url=f"{self.url_base}/report_types/{self.original_name}",
+                headers=self.http_headers,
+            )
+            response = self._request(prepared_request=prepared_request, context=None).json()
+        return response["data_available_start"], response["data_available_end"]
+
+    def retrieve_report_types(self) -> dict[str, dict]:
+        """Get all report types available to the current account, by id."""
         prepared_request = self.build_prepared_request(
             method="GET",
-            url=f"{self.url_base}/report_types/{self.original_name}",
+            url=f"{self.url_base}/report_types",
             headers=self.http_headers,
         )
+        self.logger.info("retrieving data availability of all report types")
         response = self._request(prepared_request=prepared_request, context=None).json()
-        return response["data_available_start"], response["data_available_end"]
+        return {report_type["id"]: report_type for report_type in response["data"]}
 
-    def check_pending_reports(self, report_start_at:int) -> str | None:
-        """Check if there are any pending reports."""
+    def report_columns(self) -> list[str] | None:
+        """Return the report columns to request, or None for the report type's default columns.
+
+        Columns are the catalog-selected properties plus the `id_keys`, in schema order.
+        When every column is selected, no list is sent and Stripe's defaults apply.
+        """
+        generated = {*GENERATED_COLUMNS, self.primary_keys[0]}
+        columns = [name for name in self.schema["properties"] if name not in generated]
+        selected = [name for name in columns if name in self.id_keys or self.mask.get(("properties", name), True)]
+        return None if len(selected) == len(columns) else selected
+
+    @staticmethod
+    def _has_columns(run_columns: list[str] | None, columns: list[str] | None) -> bool:
+        """Whether a run with `run_columns` contains all `columns`; None means the default columns."""
+        if run_columns is None:
+            return True
+        return columns is not None and set(columns) <= set(run_columns)
+
+    def check_pending_reports(self, report_start_at:int, columns: list[str] | None = None) -> str | None:
+        """Check if there are any pending reports with at least the requested columns."""
         prepared_request = self.build_prepared_request(
             method="GET", url=f"{self.url_base}/report_runs", headers=self.http_headers, params={"limit": 100},
         )
@@ -94,6 +836,7 @@ class StripeReportStream(StripeStream):
             if report.get("report_type") == self.original_name
             and report.get("status") == "succeeded"
             and report.get("parameters")["interval_start"] == report_start_at
+            and self._has_columns(report["parameters"].get("columns"), columns)
         ]
         latest_report = next(iter(reports), None)
         if latest_report:
@@ -101,15 +844,26 @@ class StripeReportStream(StripeStream):
             return latest_report["result"]["url"]
         return None
 
-    def issue_run(self, interval_start:int, interval_end:int) -> str:
-        """Issue a report run."""
-        params = {
+    def issue_run(
+        self, interval_start:int, interval_end:int, columns: list[str] | None = None, attempt: int = 0,
+    ) -> str:
+        """Issue a report run, for only `columns` if given.
+
+        The request carries an idempotency key derived from the run parameters, so
+        issuing the same run again, e.g. after a crash, returns the existing run. A
+        later `attempt` gets its own key, so a run that failed is not returned again.
+        """
+        params: dict[str, Any] = {
             "report_type": self.original_name,
             "parameters[interval_start]": interval_start,
             "parameters[interval_end]": interval_end,
         }
+        if columns:
+            params["parameters[columns][]"] = columns
+        key_params = {**params, "attempt": attempt} if attempt else params
+        headers = {**self.http_headers, "Idempotency-Key": self.idempotency_key(key_params)}
         prepared_request = self.build_prepared_request(
-            method="POST", url=f"{self.url_base}/report_runs", params=params, headers=self.http_headers, json={},
+            method="POST", url=f"{self.url_base}/report_runs", params=params, headers=headers, json={},
         )
         self.logger.info(
             "issuing report %s with interval_start=%s and interval_end=%s",
@@ -120,8 +874,18 @@ class StripeReportStream(StripeStream):
         response = self._request(prepared_request=prepared_request, context=None).json()
         return response["id"]
 
+    def idempotency_key(self, params: dict[str, Any]) -> str:
+        """Return the Idempotency-Key of a report run with these parameters, for the current account."""
+        account = self._account()
+        payload = json.dumps([account["id"] if account else None, params], sort_keys=True)
+        return f"tap-stripe-{sha256(payload.encode()).hexdigest()}"
+
     def get_download_url(self, run_id:str) -> str | None:
-        """Retrieve the download URL for the report."""
+        """Retrieve the download URL for the report.
+
+        Raises:
+            ReportRunFailedError: If the run failed, was canceled or cannot be retrieved.
+        """
         prepared_request = self.build_prepared_request(
             method="GET",
             url=f"{self.url_base}/report_runs/{run_id}",
@@ -131,63 +895,229 @@ class StripeReportStream(StripeStream):
         self.logger.info("retrieving download url for report %s", self.original_name)
         while retry <= 6:  # noqa: PLR2004
             try:
-                return self._request(prepared_request, None).json().get("result").get("url")
-            except:  # noqa: E722, PERF203
-                retry += 1
-                sleep = 2**retry
-                self.logger.info("backing off for %s seconds.", sleep)
-                time.sleep(sleep)
+                run = self._request(prepared_request, None).json()
+            except FatalAPIError as error:
+                msg = f"Report run {run_id} of report {self.original_name} could not be retrieved: {error}"
+                raise ReportRunFailedError(msg) from error
+            except:  # noqa: E722
+                run = {}
+            if run.get("status") in FAILED_RUN_STATUSES:
+                msg = f"Report run {run_id} of report {self.original_name} is {run['status']}"
+                raise ReportRunFailedError(msg)
+            url = (run.get("result") or {}).get("url")
+            if url:
+                return url
+            if self._tap.runtime_exceeded():
+                self.logger.info("Leaving report run %s for the next sync, max_runtime was reached", run_id)
+                return None
+            retry += 1
+            sleep = 2**retry
+            self.logger.info("backing off for %s seconds.", sleep)
+            time.sleep(sleep)
         return None
 
-    def get_records(self, context: dict | None) -> Iterable[dict[str, Any]]:
-        """Get records."""
+    @property
+    def report_start_at(self) -> int | None:
+        """The interval start of the report run the current thread is fetching."""
+        return getattr(self._local, "report_start_at", None)
+
+    @report_start_at.setter
+    def report_start_at(self, value: int) -> None:
+        self._local.report_start_at = value
+
+    @property
+    def report_end_at(self) -> int | None:
+        """The interval end of the report run the current thread is fetching."""
+        return getattr(self._local, "report_end_at", None)
+
+    @report_end_at.setter
+    def report_end_at(self, value: int) -> None:
+        self._local.report_end_at = value
+
+    def plan(self) -> StreamPlan:
+        """Estimate the report runs, requests and bytes of syncing this report for a few sampled partitions.
+
+        Each run takes a check for reusable runs, the run itself, at least one poll and
+        the download. Its size is extrapolated from the most recent succeeded run of the
+        same report type, by the length of the interval.
+        """
+        partitions = self.partitions
+        if partitions is None and not self.in_shard(None):
+            return StreamPlan(self.name, describe_layout([]))
+        contexts: list[dict | None] = [None] if partitions is None else list(partitions)
+        plan = StreamPlan(self.name, describe_layout(partitions), partitions=len(contexts))
+        if not contexts:
+            return plan
+        runs, sizes = 0, []
+        sampled = sample(contexts)
+        for context in sampled:
+            self._partition_context = context
+            self._write_starting_replication_value(context)
+            start_date = self.get_starting_replication_key_value(context)
+            if isinstance(start_date, str):
+                start_date = to_timestamp(start_date)
+            data_available_start, data_available_end = self.retrieve_report_data_availability()
+            interval_start = max(data_available_start, start_date or 0)
+            if interval_start >= data_available_end:
+                continue
+            runs += 1
+            bytes_per_second = self._previous_run_bytes_per_second()
+            if bytes_per_second is not None:
+                sizes.append(bytes_per_second * (data_available_end - interval_start))
+        scale = len(contexts) / len(sampled)
+        plan.report_runs = round(runs * scale)
+        plan.requests = len(contexts) + 4 * plan.report_runs
+        plan.bytes = round(sum(sizes) / len(sizes) * runs * scale) if sizes else None
+        plan.concurrency = min(len(contexts), max(1, self.config.get("account_concurrency", 1)))
+        plan.latency = self._mean_latency()
+        return plan
+
+    def _previous_run_bytes_per_second(self) -> float | None:
+        """Return the file size per second of interval of the latest succeeded run of this report type."""
+        prepared_request = self.build_prepared_request(
+            method="GET", url=f"{self.url_base}/report_runs", headers=self.http_headers, params={"limit": 100},
+        )
+        response = self._request(prepared_request=prepared_request, context=None).json()
+        for run in response["data"]:
+            result = run.get("result") or {}
+            interval = run["parameters"]["interval_end"] - run["parameters"]["interval_start"]
+            if run.get("report_type") == self.original_name and result.get("size") and interval > 0:
+                return result["size"] / interval
+        return None
+
+    def _get_partition_records(self, context: dict | None) -> Iterable[dict[str, Any]]:
         start_date = self.get_starting_replication_key_value(context)
         data_available_start, data_available_end = self.retrieve_report_data_availability()
 
         if start_date and type(start_date) is str:
-            start_date = int(datetime.timestamp(datetime.strptime(start_date, "%Y-%m-%dT%H:%M:%SZ")))  # noqa: DTZ007
+            start_date = to_timestamp(start_date)
 
         report_start_at = max(data_available_start, start_date)
         report_end_at = data_available_end
 
-        if report_start_at < report_end_at:
-            self.report_start_at = report_start_at
-            url = self.check_pending_reports(report_start_at=report_start_at)
-            if not url:
-                self.report_end_at = report_end_at
-                run_id = self.issue_run(report_start_at, report_end_at)
-                url = self.get_download_url(run_id)
+        if report_start_at >= report_end_at:
+            return
+        self.report_start_at = report_start_at
+        columns = self.report_columns()
+        in_flight = self.get_context_state(context).get("in_flight_run")
+        if in_flight and in_flight["interval_start"] == report_start_at and in_flight.get("columns") == columns:
+            self.logger.info("resuming report run %s of report %s", in_flight["id"], self.original_name)
+            self.report_end_at = in_flight["interval_end"]
+            skip_rows = in_flight.get("rows", 0)
+        else:
+            url = self.check_pending_reports(report_start_at=report_start_at, columns=columns)
+            if url:
+                if in_flight:
+                    yield StateUpdate({"in_flight_run": None})
+                yield from self.download_report(context=context, url=url)
+                return
+            self.report_end_at = report_end_at
+            run_id = self.issue_run(report_start_at, report_end_at, columns)
+            in_flight = {"id": run_id, "interval_start": report_start_at, "interval_end": report_end_at}
+            if columns:
+                in_flight["columns"] = columns
+            skip_rows = 0
+            yield StateUpdate({"in_flight_run": in_flight})
+        for _ in range(REPORT_RUN_ATTEMPTS):
+            try:
+                with self.performance_metrics.time(Section.REPORT_WAIT, context):
+                    url = self.get_download_url(in_flight["id"])
+            except ReportRunFailedError as error:
+                self.logger.warning("%s, issuing a new run", error)
+                in_flight = self._reissue_run(in_flight)
+                skip_rows = 0
+                yield StateUpdate({"in_flight_run": in_flight})
+                continue
             if url is not None:
-                return self.download_report(context=context, url=url)
-        return []
+                yield from self.download_report(context=context, url=url, skip_rows=skip_rows)
+                yield StateUpdate({"in_flight_run": None})
+            return
+
+    def _reissue_run(self, in_flight: dict) -> dict:
+        """Issue the in-flight run again as its next attempt, returning the new in-flight run."""
+        attempt = in_flight.get("attempt", 0) + 1
+        columns = in_flight.get("columns")
+        run_id = self.issue_run(in_flight["interval_start"], in_flight["interval_end"], columns, attempt=attempt)
+        return {
+            "id": run_id,
+            "interval_start": in_flight["interval_start"],
+            "interval_end": in_flight["interval_end"],
+            **({"columns": columns} if columns else {}),
+            "attempt": attempt,
+        }
 
-    def download_report(self, context: dict | None, url: str) -> Iterable[dict[str, Any]]:
-        """Download the report."""
+    def _checkpointed(self, records: typing.Generator[Any, None, None], context: dict | None) -> Iterable[Any]:
+        """Yield rows until `max_runtime` is reached, then pause with the rows written of the in-flight run.
+
+        The next sync downloads the run again and skips those rows. Rows of a reused
+        run that was never in flight cannot be resumed, so they are all written.
+        """
+        if not self.config.get("max_runtime"):
+            yield from records
+            return
+        rows = 0
+        for record in records:
+            if not isinstance(record, StateUpdate):
+                in_flight = self.get_context_state(context).get("in_flight_run")
+                if in_flight is not None and self._tap.runtime_exceeded():
+                    records.close()
+                    self._pause(context, {"in_flight_run": {**in_flight, "rows": in_flight.get("rows", 0) + rows}})
+                    return
+                rows += 1
+            yield record
+
+    def get_records(self, context: dict | None) -> Iterable[dict[str, Any]]:
+        """Get records, recording issued report runs in the partition's state until they are downloaded."""
+        for record in super().get_records(context):
+            if isinstance(record, StateUpdate):
+                self._update_state(context, record.values)
+            else:
+                yield record
+
+    def download_report(self, context: dict | None, url: str, skip_rows: int = 0) -> Iterable[dict[str, Any]]:
+        """Download the report to a temporary file and yield its rows, after the first `skip_rows`.
+
+        With `report_parse_processes` above 1, large files are parsed in chunks by a
+        pool of worker processes, at most one per CPU, and rows are still yielded in
+        file order.
+        """
         prepared_request = self.build_prepared_request(
             method="GET",
             url=url,
             headers=self.http_headers,
         )
         self.logger.info("downloading report %s", self.original_name)
-        response = self._request(prepared_request=prepared_request, context=None)
-        csv_file = StringIO(response.text)
-        dict_reader = csv.DictReader(csv_file)
-        return [self.post_process(record, context) for record in dict_reader]
+        with tempfile.NamedTemporaryFile(prefix="tap-stripe-", suffix=".csv") as spool:
+            response = self._request(prepared_request=prepared_request, context=None, stream=True)
+            for block in response.iter_content(chunk_size=SPOOL_BLOCK_BYTES):
+                spool.write(block)
+            spool.flush()
+            self.performance_metrics.observe_page(context)
+            processes = min(self.config.get("report_parse_processes", 1), os.cpu_count() or 1)
+            converter = self._local.row_converter = self.row_converter(context)
+            if processes > 1 and spool.tell() > reports.CHUNK_BYTES:
+                rows = reports.parse_parallel(spool.name, converter, processes)
+                yield from self.performance_metrics.time_iter(Section.PARSE, context, islice(rows, skip_rows, None))
+                return
+            with open(spool.name, newline="", encoding="utf-8") as csv_file:  # noqa: PTH123
+                rows = (self.post_process(record, context) for record in islice(csv.DictReader(csv_file), skip_rows, None))
+                yield from self.performance_metrics.time_iter(Section.PARSE, context, rows)
 
     def safe_eval(self, value):  # noqa: ANN001, ANN201
         """Safely evaluate a value."""
-        try:
-            return ast.literal_eval(value)
-        except (ValueError, SyntaxError):
-            return value
-
-    def post_process(self, row: dict, context: dict | None = None) -> dict | None:  # noqa: ARG002
-        """Post process a row."""
-        row = {key: self.safe_eval(value) for key, value in row.items()}
-        row["report_start_at"] = self.report_start_at
-        row["report_end_at"] = self.report_end_at
-        row["loaded_at"] = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")  # noqa: DTZ005
-        row[self.primary_keys[0]] = md5(  # noqa: S324
-            "".join([str(row[key]) for key in row if key in self.id_keys and row[key] is not None]).encode(),
-        ).hexdigest()
-        return row
+        return reports.safe_eval(value)
+
+    def row_converter(self, context: dict | None) -> reports.RowConverter:
+        """Return the converter from raw report rows to records for the current report run."""
+        return reports.RowConverter(
+            id_keys=tuple(self.id_keys),
+            primary_key=self.primary_keys[0],
+            report_start_at=self.report_start_at,
+            report_end_at=self.report_end_at,
+            account_id=context.get("account_id") if context else None,
+        )
+
+    def post_process(self, row: dict, context: dict | None = None) -> dict | None:
+        """Post process a row with the converter of the report run being downloaded."""
+        converter = getattr(self._local, "row_converter", None) or self.row_converter(context)
+        return converter(row)
@@ -0,0 +1,180 @@
+"""Concurrency helpers: a shared request rate budget, a shared cache and background partition fetching."""
+
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
+T = typing.TypeVar("T")
+
+_DONE = object()
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the request rate of all streams of a tap.
+
+    The bucket holds up to `capacity` tokens and refills at `rate` tokens per second.
+    `acquire` takes one token, sleeping until one is available; `try_acquire` only takes
+    one if it is available right away.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        """Create a full bucket refilling at `rate` tokens per second."""
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take one token, waiting for it if the bucket is empty.
+
+        Returns:
+            The number of seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def try_acquire(self) -> bool:
+        """Take one token if one is available right now, without waiting."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class TTLCache(typing.Generic[T]):
+    """Thread-safe cache whose entries expire `ttl` seconds after they were computed.
+
+    Concurrent `get` calls for a missing key compute it once; the others wait for it.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        """Create an empty cache."""
+        self.ttl = ttl
+        self._entries: dict[typing.Hashable, tuple[float, T]] = {}
+        self._locks: dict[typing.Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: typing.Hashable, compute: typing.Callable[[], T]) -> T:
+        """Return the cached value of `key`, computing it if it is missing or expired."""
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                return entry[1]
+            value = compute()
+            self._entries[key] = (time.monotonic(), value)
+            return value
+
+
+class _Failure:
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+class PartitionPrefetcher(typing.Generic[T]):
+    """Fetch the items of several partitions on worker threads while they are consumed in order.
+
+    Every partition gets a bounded queue, so a worker that runs ahead of the consumer
+    blocks once `buffer_size` items are waiting instead of holding a whole partition in
+    memory. Partitions are submitted in consumption order, so the partition being
+    consumed always has a worker, and at most `max_workers` ahead of it, so workers
+    finishing small partitions do not buffer the rest of the stream. Errors raised by
+    `fetch` are re-raised to the consumer.
+    """
+
+    def __init__(
+        self,
+        fetch: typing.Callable[[dict | None], typing.Iterable[T]],
+        contexts: typing.Sequence[dict | None],
+        max_workers: int,
+        buffer_size: int = 1000,
+    ) -> None:
+        """Start fetching `contexts` with up to `max_workers` threads."""
+        self._fetch = fetch
+        self._stopped = threading.Event()
+        self._queues = {self._key(context): queue.Queue(maxsize=buffer_size) for context in contexts}
+        self._unsubmitted = {self._key(context): context for context in contexts}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tap-stripe-partition")
+        for key in list(self._unsubmitted)[:max_workers]:
+            self._submit(key)
+
+    @staticmethod
+    def _key(context: dict | None) -> str:
+        return json.dumps(context, sort_keys=True, default=str)
+
+    def _submit(self, key: str) -> None:
+        context = self._unsubmitted.pop(key)
+        self._executor.submit(self._produce, self._fetch, context, self._queues[key])
+
+    def __contains__(self, context: dict | None) -> bool:
+        """Whether `context` is one of the partitions still to be consumed."""
+        return self._key(context) in self._queues
+
+    def _produce(
+        self, fetch: typing.Callable[[dict | None], typing.Iterable[T]], context: dict | None, items: queue.Queue,
+    ) -> None:
+        try:
+            for item in fetch(context):
+                if not self._put(items, item):
+                    return
+        except BaseException as error:  # noqa: BLE001
+            self._put(items, _Failure(error))
+        else:
+            self._put(items, _DONE)
+
+    def _put(self, items: queue.Queue, item: object) -> bool:
+        while not self._stopped.is_set():
+            try:
+                items.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def records(self, context: dict | None) -> typing.Iterator[T]:
+        """Yield the items of one partition as its worker produces them, submitting the next partition."""
+        key = self._key(context)
+        items = self._queues.pop(key)
+        if key in self._unsubmitted:
+            self._submit(key)
+        if self._unsubmitted:
+            self._submit(next(iter(self._unsubmitted)))
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether every partition has been handed to the consumer."""
+        return not self._queues
+
+    def close(self) -> None:
+        """Stop all workers and wait for them to exit."""
+        self._stopped.set()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,136 @@
+"""Record conforming compiled from a stream's schema and selection, instead of walking them per record."""
+
+from __future__ import annotations
+
+import typing
+
+from singer_sdk.helpers._typing import (
+    EmptySchemaTypeError,
+    _conform_primitive_property,
+    _is_exclusive_boolean_type,
+    is_object_type,
+    is_uniform_list,
+)
+
+if typing.TYPE_CHECKING:
+    from singer_sdk._singerlib import SelectionMask
+
+Conformer = typing.Callable[[typing.Any, list], typing.Any]
+
+# Types decoded from JSON, which the SDK only changes for boolean-only properties.
+PLAIN_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def _primitive(schema: dict) -> Conformer | None:
+    """Return a conformer for a primitive value, or None if JSON values pass unchanged."""
+    if not _is_exclusive_boolean_type(schema):
+        return None
+
+    def conform_boolean(value: typing.Any, unmapped: list) -> typing.Any:  # noqa: ANN401, ARG001
+        if type(value) in PLAIN_TYPES:
+            return None if value is None else value != 0
+        return _conform_primitive_property(value, schema)
+
+    return conform_boolean
+
+
+def _is_list(schema: dict) -> bool:
+    """Whether the SDK conforms the property as a list; untyped properties are never lists."""
+    try:
+        return bool(is_uniform_list(schema))
+    except (EmptySchemaTypeError, ValueError):
+        return False
+
+
+def _is_object(schema: dict) -> bool:
+    return bool(is_object_type(schema)) and "properties" in schema
+
+
+def _property(schema: dict, mask: SelectionMask | None, breadcrumb: tuple[str, ...], path: str) -> Conformer:
+    primitive = _primitive(schema)
+    if _is_list(schema):
+        items = schema["items"]
+        item_object = _object(items, None, (), path) if _is_object(items) else None
+        item_primitive = _primitive(items)
+
+        def conform_list(value: typing.Any, unmapped: list) -> typing.Any:  # noqa: ANN401
+            if not isinstance(value, list):
+                return _conform(primitive, schema, value, unmapped)
+            return [
+                item_object(item, unmapped) if item_object is not None and isinstance(item, dict)
+                else _conform(item_primitive, items, item, unmapped)
+                for item in value
+            ]
+
+        return conform_list
+    if _is_object(schema):
+        conform_object = _object(schema, mask, breadcrumb, path)
+
+        def conform_nested(value: typing.Any, unmapped: list) -> typing.Any:  # noqa: ANN401
+            if isinstance(value, dict):
+                return conform_object(value, unmapped)
+            return _conform(primitive, schema, value, unmapped)
+
+        return conform_nested
+
+    def conform_value(value: typing.Any, unmapped: list) -> typing.Any:  # noqa: ANN401
+        return _conform(primitive, schema, value, unmapped)
+
+    return conform_value
+
+
+def _conform(primitive: Conformer | None, schema: dict, value: typing.Any, unmapped: list) -> typing.Any:  # noqa: ANN401
+    if primitive is not None:
+        return primitive(value, unmapped)
+    return value if type(value) in PLAIN_TYPES else _conform_primitive_property(value, schema)
+
+
+def _object(schema: dict, mask: SelectionMask | None, breadcrumb: tuple[str, ...], path: str) -> Conformer:
+    properties: dict[str, Conformer | None] = {}
+    passthrough: set[str] = set()
+    for name, property_schema in schema["properties"].items():
+        property_breadcrumb = (*breadcrumb, "properties", name)
+        if mask is not None and not mask[property_breadcrumb]:
+            properties[name] = None
+            continue
+        properties[name] = _property(property_schema, mask, property_breadcrumb, f"{path}.{name}" if path else name)
+        if not _is_list(property_schema) and not _is_object(property_schema) and not _primitive(property_schema):
+            passthrough.add(name)
+    keep_unmapped = bool(schema.get("additionalProperties"))
+    prefix = f"{path}." if path else ""
+
+    def conform_object(value: dict, unmapped: list) -> dict:
+        output = {}
+        for name, item in value.items():
+            if name in passthrough and type(item) in PLAIN_TYPES:
+                output[name] = item
+            elif name in properties:
+                conform = properties[name]
+                if conform is not None:
+                    output[name] = conform(item, unmapped)
+            else:
+                if keep_unmapped:
+                    output[name] = item
+                unmapped.append(prefix + name)
+        return output
+
+    return conform_object
+
+
+def compile_conformer(schema: dict, mask: SelectionMask) -> typing.Callable[[dict], tuple[dict, list[str]]]:
+    """Compile a function dropping deselected properties and conforming values like the SDK does.
+
+    The result matches `pop_deselected_record_properties` followed by a recursive
+    `conform_record_data_types`, but the schema and selection are resolved once, so
+    per record only the properties present are visited, and plain JSON values of
+    non-boolean properties are copied without any further checks. The returned
+    function gives the conformed record and the paths of properties missing from the
+    schema.
+    """
+    conform_record = _object(schema, mask, (), "")
+
+    def conform(record: dict) -> tuple[dict, list[str]]:
+        unmapped: list[str] = []
+        return conform_record(record, unmapped), unmapped
+
+    return conform
@@ -0,0 +1,50 @@
+"""Drop records already emitted during a sync, in memory proportional to the number of records."""
+
+from __future__ import annotations
+
+import typing
+from array import array
+from bisect import bisect_left
+
+BUCKET_BITS = 12
+DIGEST_MASK = (1 << 64) - 1
+
+
+def key_digest(values: typing.Iterable[typing.Any]) -> int:
+    """Return a 64-bit digest of a primary key's values.
+
+    Python's string hash is keyed per process, which is fine for keys that only live
+    for one sync and much faster than a cryptographic digest.
+    """
+    return hash(tuple(values)) & DIGEST_MASK
+
+
+class SeenKeys:
+    """Set of primary keys stored as 64-bit digests, about 9 bytes per key.
+
+    Digests are spread over 4096 buckets by their top bits, each a sorted array, so a
+    lookup is a binary search and an insert moves a few kilobytes at most even with tens
+    of millions of keys. The buckets themselves cost a fixed ~300 KiB. Two keys can only
+    be confused if their 64-bit digests collide, which for ten million keys happens with
+    a probability of about one in 400,000 per sync.
+    """
+
+    def __init__(self) -> None:
+        """Start without any keys."""
+        self._buckets = [array("Q") for _ in range(1 << BUCKET_BITS)]
+        self._count = 0
+
+    def add(self, values: typing.Iterable[typing.Any]) -> bool:
+        """Remember a key, returning whether it was new."""
+        digest = key_digest(values)
+        bucket = self._buckets[digest >> (64 - BUCKET_BITS)]
+        index = bisect_left(bucket, digest)
+        if index < len(bucket) and bucket[index] == digest:
+            return False
+        bucket.insert(index, digest)
+        self._count += 1
+        return True
+
+    def __len__(self) -> int:
+        """Return the number of keys seen."""
+        return self._count
@@ -0,0 +1,311 @@
+"""Per-stream performance metrics for tap-stripe."""
+
+from __future__ import annotations
+
+import enum
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+import typing
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from singer_sdk import metrics
+
+if typing.TYPE_CHECKING:
+    import logging
+
+T = typing.TypeVar("T")
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, math.inf)
+ID_SEGMENT = re.compile(r"[a-z]+_(?=[A-Za-z0-9]*[0-9A-Z])[A-Za-z0-9]{8,}")
+
+
+class StripeMetric(str, enum.Enum):
+    """Metric names emitted in addition to the SDK's built-in metrics."""
+
+    HTTP_REQUEST_LATENCY = "http_request_latency"
+    BYTES_DOWNLOADED = "bytes_downloaded"
+    PAGES_FETCHED = "pages_fetched"
+    RECORDS_PER_SECOND = "records_per_second"
+    HEDGED_REQUESTS = "hedged_requests"
+    SECTION_DURATION = "section_duration"
+
+
+class Section(str, enum.Enum):
+    """Phases a sync spends its time in."""
+
+    NETWORK = "network"
+    PARSE = "parse"
+    SERIALIZATION = "serialization"
+    REPORT_WAIT = "report_wait"
+
+
+def normalize_endpoint(path: str) -> str:
+    """Replace object ids in a URL path so endpoints have bounded cardinality."""
+    return "/".join("{id}" if ID_SEGMENT.fullmatch(segment) else segment for segment in path.split("/"))
+
+
+@dataclass
+class Histogram:
+    """Cumulative histogram with fixed upper bounds, as Prometheus expects."""
+
+    buckets: tuple[float, ...] = LATENCY_BUCKETS
+    counts: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    total: float = 0.0
+    count: int = 0
+
+    def observe(self, value: float) -> None:
+        """Add one observation."""
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+    def merge(self, other: Histogram) -> None:
+        """Add all observations of another histogram with the same buckets."""
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.total += other.total
+        self.count += other.count
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        """Return a JSON-serializable summary."""
+        return {
+            "buckets": {("+Inf" if math.isinf(bound) else str(bound)): count for bound, count in zip(self.buckets, self.counts)},
+            "sum": round(self.total, 6),
+            "count": self.count,
+        }
+
+
+@dataclass
+class PartitionMetrics:
+    """Measurements for one stream partition, or the whole stream if unpartitioned."""
+
+    latency: dict[str, Histogram] = field(default_factory=dict)
+    bytes_downloaded: int = 0
+    pages: int = 0
+    records: int = 0
+    hedged_requests: int = 0
+    sections: dict[str, float] = field(default_factory=lambda: {section.value: 0.0 for section in Section})
+    wall_time: float = 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        """Return the emitted records per second of wall time."""
+        return self.records / self.wall_time if self.wall_time else 0.0
+
+    def merge(self, other: PartitionMetrics) -> None:
+        """Add the measurements of another partition."""
+        for endpoint, histogram in other.latency.items():
+            self.latency.setdefault(endpoint, Histogram()).merge(histogram)
+        self.bytes_downloaded += other.bytes_downloaded
+        self.pages += other.pages
+        self.records += other.records
+        self.hedged_requests += other.hedged_requests
+        for section, seconds in other.sections.items():
+            self.sections[section] = self.sections.get(section, 0.0) + seconds
+        self.wall_time += other.wall_time
+
+
+class LatencyWindow:
+    """Latencies of the most recent requests per endpoint, to tell slow requests from usual ones.
+
+    Percentiles are only reported once an endpoint has `min_samples` observations.
+    Recording is thread-safe.
+    """
+
+    def __init__(self, size: int = 200, min_samples: int = 20) -> None:
+        """Keep the last `size` latencies of every endpoint."""
+        self.size = size
+        self.min_samples = min_samples
+        self._latencies: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint: str, seconds: float) -> None:
+        """Add the latency of one request."""
+        with self._lock:
+            self._latencies.setdefault(normalize_endpoint(endpoint), deque(maxlen=self.size)).append(seconds)
+
+    def percentile(self, endpoint: str, percent: float) -> float | None:
+        """Return the latency below which `percent` of the recent requests finished, if enough were seen."""
+        with self._lock:
+            latencies = sorted(self._latencies.get(normalize_endpoint(endpoint), ()))
+        if len(latencies) < self.min_samples:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100))]
+
+
+class StreamMetrics:
+    """Collect request, volume and timing measurements for one stream, per partition.
+
+    Measurements are keyed by the partition context, so they can be reported per
+    partition and aggregated per stream. Recording is thread-safe.
+    """
+
+    def __init__(self, stream_name: str) -> None:
+        """Create an empty collection for `stream_name`."""
+        self.stream_name = stream_name
+        self._partitions: dict[str, PartitionMetrics] = {}
+        self._contexts: dict[str, dict | None] = {}
+        self._lock = threading.Lock()
+
+    def partition(self, context: dict | None) -> PartitionMetrics:
+        """Return the measurements for a partition context, creating them if needed."""
+        key = json.dumps(context, sort_keys=True, default=str) if context else ""
+        with self._lock:
+            if key not in self._partitions:
+                self._partitions[key] = PartitionMetrics()
+                self._contexts[key] = dict(context) if context else None
+            return self._partitions[key]
+
+    def observe_request(self, endpoint: str, seconds: float, size: int, context: dict | None) -> None:
+        """Record one HTTP request."""
+        partition = self.partition(context)
+        with self._lock:
+            partition.latency.setdefault(normalize_endpoint(endpoint), Histogram()).observe(seconds)
+            partition.bytes_downloaded += size
+            partition.sections[Section.NETWORK.value] += seconds
+
+    def observe_hedge(self, context: dict | None) -> None:
+        """Record one duplicate request sent for a slow request."""
+        partition = self.partition(context)
+        with self._lock:
+            partition.hedged_requests += 1
+
+    def observe_page(self, context: dict | None) -> None:
+        """Record one fetched page or report file."""
+        partition = self.partition(context)
+        with self._lock:
+            partition.pages += 1
+
+    def observe_record(self, partition: PartitionMetrics, seconds: float) -> None:
+        """Record one emitted record and the time spent writing it, for a partition looked up once per partition."""
+        with self._lock:
+            partition.records += 1
+            partition.sections[Section.SERIALIZATION.value] += seconds
+
+    @contextmanager
+    def time(self, section: Section | None, context: dict | None) -> typing.Iterator[None]:
+        """Add the duration of the block to a section of the partition, or to its wall time."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            partition = self.partition(context)
+            with self._lock:
+                if section is None:
+                    partition.wall_time += elapsed
+                else:
+                    partition.sections[section.value] += elapsed
+
+    def time_iter(self, section: Section, context: dict | None, items: typing.Iterable[T]) -> typing.Iterator[T]:
+        """Yield from `items`, adding the time spent producing each item to a section of the partition."""
+        iterator = iter(items)
+        partition = self.partition(context)
+        perf_counter = time.perf_counter
+        while True:
+            started = perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed = perf_counter() - started
+                with self._lock:
+                    partition.sections[section.value] += elapsed
+            yield item
+
+    def total(self) -> PartitionMetrics:
+        """Return the measurements of all partitions combined."""
+        total = PartitionMetrics()
+        with self._lock:
+            for partition in self._partitions.values():
+                total.merge(partition)
+        return total
+
+    def points(self) -> typing.Iterator[metrics.Point]:
+        """Yield SDK metric points for every partition and for the stream as a whole."""
+        with self._lock:
+            partitions = [(self._contexts[key], partition) for key, partition in self._partitions.items()]
+        if len(partitions) > 1 or (partitions and partitions[0][0] is not None):
+            for context, partition in partitions:
+                yield from self._partition_points(partition, {metrics.Tag.CONTEXT: context})
+        yield from self._partition_points(self.total(), {})
+
+    def _partition_points(self, partition: PartitionMetrics, tags: dict) -> typing.Iterator[metrics.Point]:
+        tags = {metrics.Tag.STREAM: self.stream_name, **tags}
+        for endpoint, histogram in partition.latency.items():
+            yield metrics.Point(
+                "histogram",
+                StripeMetric.HTTP_REQUEST_LATENCY,
+                histogram.to_dict(),
+                {**tags, metrics.Tag.ENDPOINT: endpoint},
+            )
+        yield metrics.Point("counter", StripeMetric.BYTES_DOWNLOADED, partition.bytes_downloaded, tags)
+        yield metrics.Point("counter", StripeMetric.PAGES_FETCHED, partition.pages, tags)
+        yield metrics.Point("counter", StripeMetric.HEDGED_REQUESTS, partition.hedged_requests, tags)
+        yield metrics.Point("gauge", StripeMetric.RECORDS_PER_SECOND, round(partition.records_per_second, 2), tags)
+        for section, seconds in partition.sections.items():
+            yield metrics.Point("timer", StripeMetric.SECTION_DURATION, round(seconds, 6), {**tags, "section": section})
+
+    def log(self, logger: logging.Logger) -> None:
+        """Write all points as SDK `METRIC:` log lines."""
+        for point in self.points():
+            metrics.log(logger, point)
+
+    def prometheus_samples(self) -> typing.Iterator[tuple[str, str]]:
+        """Yield `(metric family, sample line)` pairs of the stream totals in Prometheus text format."""
+        total = self.total()
+        stream = f'stream="{self.stream_name}"'
+        latency = "tap_stripe_http_request_duration_seconds"
+        for endpoint, histogram in total.latency.items():
+            labels = f'{stream},endpoint="{endpoint}"'
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                le = "+Inf" if math.isinf(bound) else repr(bound)
+                yield latency, f'{latency}_bucket{{{labels},le="{le}"}} {count}'
+            yield latency, f"{latency}_sum{{{labels}}} {histogram.total}"
+            yield latency, f"{latency}_count{{{labels}}} {histogram.count}"
+        for family, value in (
+            ("tap_stripe_bytes_downloaded_total", total.bytes_downloaded),
+            ("tap_stripe_pages_fetched_total", total.pages),
+            ("tap_stripe_records_total", total.records),
+            ("tap_stripe_hedged_requests_total", total.hedged_requests),
+            ("tap_stripe_records_per_second", total.records_per_second),
+        ):
+            yield family, f"{family}{{{stream}}} {value}"
+        for section, seconds in total.sections.items():
+            yield "tap_stripe_section_seconds_total", f'tap_stripe_section_seconds_total{{{stream},section="{section}"}} {seconds}'
+
+
+PROMETHEUS_TYPES = {
+    "tap_stripe_http_request_duration_seconds": "histogram",
+    "tap_stripe_bytes_downloaded_total": "counter",
+    "tap_stripe_pages_fetched_total": "counter",
+    "tap_stripe_records_total": "counter",
+    "tap_stripe_hedged_requests_total": "counter",
+    "tap_stripe_records_per_second": "gauge",
+    "tap_stripe_section_seconds_total": "counter",
+}
+
+
+def write_prometheus_textfile(path: str, stream_metrics: typing.Iterable[StreamMetrics]) -> None:
+    """Atomically write the metrics of all streams to a node_exporter textfile."""
+    families: dict[str, list[str]] = {family: [] for family in PROMETHEUS_TYPES}
+    for collected in stream_metrics:
+        for family, line in collected.prometheus_samples():
+            families[family].append(line)
+    output = []
+    for family, lines in families.items():
+        if lines:
+            output.extend([f"# TYPE {family} {PROMETHEUS_TYPES[family]}", *lines])
+    directory = os.path.dirname(os.path.abspath(path))  # noqa: PTH100, PTH120
+    with tempfile.NamedTemporaryFile("w", dir=directory, delete=False, suffix=".tmp") as handle:
+        handle.write("\n".join(output) + "\n")
+    os.replace(handle.name, path)  # noqa: PTH105
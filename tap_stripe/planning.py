@@ -0,0 +1,113 @@
+"""Estimate what a sync will cost before running it."""
+
+from __future__ import annotations
+
+import typing
+from dataclasses import dataclass
+
+T = typing.TypeVar("T")
+
+PLAN_SAMPLE_PARTITIONS = 3
+
+
+@dataclass
+class StreamPlan:
+    """Estimated cost of syncing one stream, extrapolated from a few probe requests."""
+
+    stream: str
+    layout: str
+    partitions: int = 0
+    requests: int = 0
+    records: int | None = None
+    bytes: int | None = None
+    report_runs: int = 0
+    concurrency: int = 1
+    latency: float = 0.0
+
+    def seconds(self, requests_per_second: float) -> float:
+        """Return the expected runtime, bound by either the rate budget or the request latency.
+
+        Report runs also wait for Stripe to generate the report, which is not included.
+        """
+        return max(self.requests / requests_per_second, self.requests * self.latency / self.concurrency)
+
+
+def sample(contexts: list[T]) -> list[T]:
+    """Pick up to `PLAN_SAMPLE_PARTITIONS` contexts spread evenly over the list, including the first and last."""
+    if len(contexts) <= PLAN_SAMPLE_PARTITIONS:
+        return list(contexts)
+    step = (len(contexts) - 1) / (PLAN_SAMPLE_PARTITIONS - 1)
+    return [contexts[round(i * step)] for i in range(PLAN_SAMPLE_PARTITIONS)]
+
+
+def describe_layout(contexts: list[dict] | None) -> str:
+    """Describe partitions as e.g. `2 accounts x 13 windows of 7 days`."""
+    if contexts is None:
+        return "1 partition"
+    if not contexts:
+        return "synced by another shard"
+    accounts = {context["account_id"] for context in contexts if "account_id" in context}
+    windows = {(context["created_gte"], context["created_lt"]) for context in contexts if "created_gte" in context}
+    parts = []
+    if accounts:
+        parts.append(f"{len(accounts)} account{'s' * (len(accounts) != 1)}")
+    if windows:
+        lower, upper = next(iter(windows))
+        parts.append(f"{len(windows)} window{'s' * (len(windows) != 1)} of {(upper - lower) // 86400} days")
+    return " x ".join(parts)
+
+
+def _format_bytes(size: int | None) -> str:
+    if size is None:
+        return "?"
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024:  # noqa: PLR2004
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TiB"
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def format_plan(plans: list[StreamPlan], requests_per_second: float) -> str:
+    """Render stream plans and their totals as a text table."""
+    header = ("stream", "partitions", "layout", "records", "requests", "report runs", "bytes", "runtime")
+    rows = [
+        (
+            plan.stream,
+            str(plan.partitions),
+            plan.layout,
+            "?" if plan.records is None else str(plan.records),
+            str(plan.requests),
+            str(plan.report_runs),
+            _format_bytes(plan.bytes),
+            _format_seconds(plan.seconds(requests_per_second)),
+        )
+        for plan in plans
+    ]
+    known_bytes = [plan.bytes for plan in plans if plan.bytes is not None]
+    rows.append(
+        (
+            "total",
+            str(sum(plan.partitions for plan in plans)),
+            "",
+            str(sum(plan.records or 0 for plan in plans)),
+            str(sum(plan.requests for plan in plans)),
+            str(sum(plan.report_runs for plan in plans)),
+            _format_bytes(sum(known_bytes)) if known_bytes else "?",
+            _format_seconds(sum(plan.seconds(requests_per_second) for plan in plans)),
+        ),
+    )
+    widths = [max(len(row[index]) for row in [header, *rows]) for index in range(len(header))]
+    lines = ["  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip() for row in [header, *rows]]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    lines.append(
+        f"\nRuntime assumes {requests_per_second:g} requests/s and the latency of the probe requests; "
+        "report runs also wait for Stripe to generate each report.",
+    )
+    return "\n".join(lines)
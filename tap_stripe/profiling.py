@@ -0,0 +1,185 @@
+"""Profiling helpers for tap-stripe sync runs."""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import inspect
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import typing
+from collections import Counter
+from contextlib import contextmanager
+
+if typing.TYPE_CHECKING:
+    import logging
+    import types
+
+PROFILE_MODES = ("cprofile", "sampling")
+SAMPLING_INTERVAL = 0.005
+
+
+def profile_output_path(path: str) -> str:
+    """Expand the `{pid}` and `{timestamp}` placeholders of a profile path."""
+    return path.format(pid=os.getpid(), timestamp=int(time.time()))
+
+
+@contextmanager
+def profile_run(path: str, mode: str = "cprofile", interval: float = SAMPLING_INTERVAL) -> typing.Iterator[None]:
+    """Profile the block and write the result to `path`.
+
+    `cprofile` writes a pstats file, readable with `python -m pstats`, snakeviz or
+    flameprof. `sampling` samples every thread's stack every `interval` seconds and
+    writes collapsed stacks, the input format of flamegraph.pl and speedscope. Both
+    include the threads that fetch pages and partitions in the background.
+    """
+    if mode not in PROFILE_MODES:
+        msg = f"Unknown profile mode {mode!r}, expected one of {', '.join(PROFILE_MODES)}"
+        raise ValueError(msg)
+    path = profile_output_path(path)
+    if mode == "cprofile":
+        profilers = [cProfile.Profile()]
+        if sys.version_info < (3, 12):
+            # Until Python 3.12, a profiler only sees the thread that enabled it.
+            threading.setprofile(functools.partial(_profile_thread, profilers))
+        profilers[0].enable()
+        try:
+            yield
+        finally:
+            profilers[0].disable()
+            threading.setprofile(None)  # type: ignore[arg-type]
+            stats = pstats.Stats(profilers[0])
+            for profiler in list(profilers[1:]):
+                stats.add(profiler)
+            stats.dump_stats(path)
+        return
+
+    sampler = StackSampler(interval)
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+        sampler.write(path)
+
+
+def _profile_thread(profilers: list[cProfile.Profile], *_: typing.Any) -> None:
+    """Profile function of new threads, replacing itself with a profiler of the thread."""
+    sys.setprofile(None)
+    profiler = cProfile.Profile()
+    profilers.append(profiler)
+    profiler.enable()
+
+
+class StackSampler(threading.Thread):
+    """Background thread counting the collapsed stacks of all other threads.
+
+    Each stack starts with the name of its thread, without the index pools append, so
+    the workers of one pool share a root frame.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """Sample every `interval` seconds once started."""
+        super().__init__(name="tap-stripe-stack-sampler", daemon=True)
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:  # noqa: D102
+        while not self._stopped.wait(self.interval):
+            names = {thread.ident: re.sub(r"_\d+$", "", thread.name) for thread in threading.enumerate()}
+            for thread_id, top in sys._current_frames().items():  # noqa: SLF001
+                if thread_id == self.ident:
+                    continue
+                stack = []
+                frame: types.FrameType | None = top
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")  # noqa: PTH119
+                    frame = frame.f_back
+                if stack:
+                    stack.append(names.get(thread_id, "thread"))
+                    self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the thread to finish."""
+        self._stopped.set()
+        self.join()
+
+    def write(self, path: str) -> None:
+        """Write the samples in collapsed stack format."""
+        with open(path, "w") as handle:  # noqa: PTH123
+            handle.writelines(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class SectionTimers:
+    """Call counters and cumulative wall time for named hot sections of a stream.
+
+    Sections are bound by wrapping methods on the stream instance, so nothing is
+    measured, and nothing costs anything, unless section profiling is enabled.
+    Generator methods are timed per step, excluding the time spent by the consumer.
+    """
+
+    def __init__(self) -> None:
+        """Create empty timers."""
+        self.calls: Counter[str] = Counter()
+        self.seconds: Counter[str] = Counter()
+
+    def wrap(self, name: str, func: typing.Callable) -> typing.Callable:
+        """Return `func` wrapped to count calls and time into section `name`."""
+        perf_counter = time.perf_counter
+        calls = self.calls
+        seconds = self.seconds
+
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def timed_generator(*args: typing.Any, **kwargs: typing.Any) -> typing.Iterator:
+                calls[name] += 1
+                iterator = func(*args, **kwargs)
+                while True:
+                    started = perf_counter()
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        seconds[name] += perf_counter() - started
+                        return
+                    seconds[name] += perf_counter() - started
+                    yield item
+
+            return timed_generator
+
+        @functools.wraps(func)
+        def timed(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:  # noqa: ANN401
+            calls[name] += 1
+            started = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds[name] += perf_counter() - started
+
+        return timed
+
+    def instrument(self, obj: object, names: typing.Iterable[str]) -> None:
+        """Replace the named methods of `obj` with timed wrappers."""
+        for name in names:
+            method = getattr(obj, name, None)
+            if method is not None:
+                setattr(obj, name, self.wrap(name, method))
+
+    def log(self, logger: logging.Logger, stream_name: str) -> None:
+        """Log one line per section, slowest first."""
+        for name, total in self.seconds.most_common():
+            calls = self.calls[name]
+            logger.info(
+                "section %s of stream %s: %d calls, %.3fs total, %.1fus per call",
+                name,
+                stream_name,
+                calls,
+                total,
+                total / calls * 1e6 if calls else 0.0,
+            )
@@ -0,0 +1,127 @@
+"""Report file parsing, optionally split across a pool of worker processes.
+
+This module only depends on the standard library, so spawning a worker is cheap.
+"""
+
+from __future__ import annotations
+
+import ast
+import csv
+import io
+import multiprocessing
+import typing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from hashlib import md5
+
+if typing.TYPE_CHECKING:
+    from concurrent.futures import Future
+
+CHUNK_BYTES = 4 * 1024 * 1024
+
+
+# The only literals spelled like a name; anything else starting with a letter or underscore
+# is a name or a prefixed string, e.g. b'x', which has a quote within its first 3 characters.
+NAME_LITERALS = ("True", "False", "None", "set")
+
+
+def safe_eval(value: str) -> typing.Any:  # noqa: ANN401
+    """Evaluate a CSV value as a Python literal, or return it unchanged.
+
+    Values like ids and currency codes are returned without being compiled, which
+    would intern every distinct id and periodically rebuild the interned strings table.
+    """
+    if (
+        (value[:1].isalpha() or value[:1] == "_")
+        and not value.startswith(NAME_LITERALS)
+        and "'" not in value[:3]
+        and '"' not in value[:3]
+    ):
+        return value
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+
+
+@dataclass(frozen=True)
+class RowConverter:
+    """Everything needed to turn a raw report row into a record, picklable for worker processes."""
+
+    id_keys: tuple[str, ...]
+    primary_key: str
+    report_start_at: int | None
+    report_end_at: int | None
+    account_id: str | None = None
+
+    def __call__(self, row: dict, loaded_at: str | None = None) -> dict:
+        """Convert one row read by `csv.DictReader`."""
+        row = {key: safe_eval(value) for key, value in row.items()}
+        row["report_start_at"] = self.report_start_at
+        row["report_end_at"] = self.report_end_at
+        row["loaded_at"] = loaded_at or datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")  # noqa: DTZ005
+        id_parts = [str(row[key]) for key in row if key in self.id_keys and row[key] is not None]
+        if self.account_id is not None:
+            id_parts.append(self.account_id)
+        row[self.primary_key] = md5("".join(id_parts).encode()).hexdigest()  # noqa: S324
+        return row
+
+
+def split_csv(path: str, chunk_bytes: int = CHUNK_BYTES) -> tuple[list[str], list[tuple[int, int]]]:
+    """Return the header of a CSV file and the byte ranges of chunks of about `chunk_bytes`.
+
+    Chunks end on a line boundary outside quoted fields, so quoted values spanning
+    several lines are never split. Escaped quotes (`""`) do not change the parity.
+    """
+    with open(path, "rb") as handle:  # noqa: PTH123
+        header_line = handle.readline()
+        fieldnames = next(csv.reader([header_line.decode("utf-8-sig")]), [])
+        ranges = []
+        start = offset = handle.tell()
+        quotes = 0
+        for line in handle:
+            offset += len(line)
+            quotes += line.count(b'"')
+            if quotes % 2 == 0 and offset - start >= chunk_bytes:
+                ranges.append((start, offset))
+                start = offset
+        if offset > start:
+            ranges.append((start, offset))
+    return fieldnames, ranges
+
+
+def parse_chunk(path: str, start: int, end: int, fieldnames: list[str], converter: RowConverter) -> list[dict]:
+    """Read and convert the rows in one byte range of a CSV file."""
+    with open(path, "rb") as handle:  # noqa: PTH123
+        handle.seek(start)
+        text = handle.read(end - start).decode("utf-8")
+    loaded_at = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")  # noqa: DTZ005
+    return [converter(row, loaded_at) for row in csv.DictReader(io.StringIO(text, newline=""), fieldnames=fieldnames)]
+
+
+def parse_parallel(
+    path: str, converter: RowConverter, processes: int, chunk_bytes: int = CHUNK_BYTES,
+) -> typing.Iterator[dict]:
+    """Yield the converted rows of a CSV file in file order, parsing chunks in worker processes.
+
+    At most two chunks per process are parsed ahead of the consumer, which bounds the
+    memory held by finished but unconsumed chunks.
+    """
+    fieldnames, ranges = split_csv(path, chunk_bytes)
+    # Spawned workers do not inherit the locks of the tap's other threads.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+        pending: deque[Future] = deque()
+        chunks = iter(ranges)
+        for start, end in chunks:
+            pending.append(pool.submit(parse_chunk, path, start, end, fieldnames, converter))
+            if len(pending) >= 2 * processes:
+                break
+        while pending:
+            rows = pending.popleft().result()
+            for start, end in chunks:
+                pending.append(pool.submit(parse_chunk, path, start, end, fieldnames, converter))
+                break
+            yield from rows
@@ -0,0 +1,98 @@
+"""Split one sync across several tap processes, and merge their states afterwards."""
+
+from __future__ import annotations
+
+import json
+import typing
+import zlib
+from dataclasses import dataclass
+
+import click
+
+DEFAULT_WINDOW_DAYS = 30
+EPHEMERAL_STATE_KEYS = ("progress_markers", "starting_replication_value")
+PROGRESS_STATE_KEYS = ("resume", "closed", "in_flight_run")
+
+
+@dataclass(frozen=True)
+class Shard:
+    """The part of a sync one tap process is responsible for.
+
+    Accounts and whole streams are assigned by a stable hash of their id, so every
+    process agrees on the assignment without coordinating. `created` windows are
+    assigned round-robin by their index, which spreads recent, busier windows evenly.
+    """
+
+    index: int = 0
+    count: int = 1
+
+    def owns(self, key: str) -> bool:
+        """Whether the account or stream `key` belongs to this shard."""
+        return zlib.crc32(key.encode()) % self.count == self.index
+
+    def owns_window(self, window_index: int) -> bool:
+        """Whether the window with this index belongs to this shard."""
+        return window_index % self.count == self.index
+
+
+def created_windows(start: int, end: int, days: int) -> list[dict]:
+    """Split `[start, end)` into consecutive windows of `days`, as partition contexts.
+
+    Window boundaries only depend on `start` and `days`, so a window keeps its context,
+    and with it its bookmark, from one run to the next. The last window ends after `end`.
+    """
+    size = days * 86400
+    return [{"created_gte": lower, "created_lt": lower + size} for lower in range(start, max(end, start + 1), size)]
+
+
+def _rank(bookmark: dict) -> tuple:
+    """Order copies of one bookmark: the furthest replication key value wins.
+
+    On a tie, e.g. for a partition only one shard synced, the copy with more of the
+    `PROGRESS_STATE_KEYS` wins, then the larger serialization, so the merge does not
+    depend on the order of the states.
+    """
+    value = bookmark.get("replication_key_value")
+    progress = sum(key in bookmark for key in PROGRESS_STATE_KEYS)
+    return value is not None, value, progress, json.dumps(bookmark, sort_keys=True)
+
+
+def _clean(bookmark: dict) -> dict:
+    return {key: value for key, value in bookmark.items() if key not in EPHEMERAL_STATE_KEYS}
+
+
+def merge_states(states: typing.Iterable[dict]) -> dict:
+    """Merge the final states of several shards of one sync into a single state.
+
+    Partitions are combined by context; when several shards bookmarked the same
+    partition, or the same unpartitioned stream, the furthest bookmark wins, and of
+    equal bookmarks the one that keeps `resume`, `closed` or `in_flight_run`.
+    Partitions are sorted by context.
+    """
+    bookmarks: dict[str, dict] = {}
+    for state in states:
+        for stream_name, bookmark in state.get("bookmarks", {}).items():
+            merged = bookmarks.setdefault(stream_name, {})
+            partitions = merged.setdefault("partitions", {})
+            for partition in bookmark.get("partitions", []):
+                key = json.dumps(partition["context"], sort_keys=True)
+                candidate = _clean(partition)
+                if key not in partitions or _rank(candidate) > _rank(partitions[key]):
+                    partitions[key] = candidate
+            stream_bookmark = _clean({key: value for key, value in bookmark.items() if key != "partitions"})
+            current = {key: value for key, value in merged.items() if key != "partitions"}
+            if _rank(stream_bookmark) > _rank(current):
+                merged.clear()
+                merged.update(stream_bookmark, partitions=partitions)
+    for merged in bookmarks.values():
+        partitions = merged.pop("partitions")
+        if partitions:
+            merged["partitions"] = [partitions[key] for key in sorted(partitions)]
+    return {"bookmarks": bookmarks}
+
+
+@click.command()
+@click.argument("state_files", nargs=-1, required=True, type=click.File())
+def merge_state(state_files: tuple[typing.TextIO, ...]) -> None:
+    """Merge the STATE_FILES written by the shards of one sync and print the result."""
+    click.echo(json.dumps(merge_states(json.load(handle) for handle in state_files), indent=2))
@@ -0,0 +1,130 @@
+"""Write records straight to compressed JSONL files, bypassing stdout and the target."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import time
+import typing
+from dataclasses import dataclass, field
+
+from singer_sdk._singerlib.json import serialize_json
+
+COMPRESSIONS = {"gzip": ".gz", "zstd": ".zst"}
+FLUSH_BYTES = 1 << 20
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+@dataclass
+class _OpenFile:
+    path: str
+    raw: typing.BinaryIO
+    writer: typing.BinaryIO
+    records: int = 0
+    buffer: list[bytes] = field(default_factory=list)
+    buffered: int = 0
+
+
+@dataclass
+class _StreamFiles:
+    schema: dict
+    key_properties: list[str]
+    files: list[dict] = field(default_factory=list)
+    current: _OpenFile | None = None
+
+
+class FileSink:
+    """Per-stream JSONL files, compressed with gzip or zstd and rotated by size.
+
+    Files of one sync are named `<stream>/<stream>-<run>-<n>.jsonl.gz` under the
+    directory and written as `.part` files, which are only renamed once complete.
+    `close` completes all files and writes `manifest-<run>.json`, listing each
+    stream's schema, key properties and files with their record counts and sizes,
+    so a loader never picks up a file that is still being written.
+    """
+
+    def __init__(self, directory: str, compression: str = "gzip", max_file_bytes: int = 256 << 20) -> None:
+        """Write files to `directory`, starting a new one when a file reaches `max_file_bytes` compressed."""
+        if compression not in COMPRESSIONS:
+            msg = f"Unsupported compression {compression!r}, expected one of {', '.join(COMPRESSIONS)}"
+            raise ValueError(msg)
+        os.makedirs(directory, exist_ok=True)  # noqa: PTH103
+        self.directory = directory
+        self.compression = compression
+        self.max_file_bytes = max_file_bytes
+        self.run = time.strftime("%Y%m%dT%H%M%S")
+        self.streams: dict[str, _StreamFiles] = {}
+
+    def write_schema(self, stream_name: str, schema: dict, key_properties: list[str]) -> None:
+        """Remember a stream's schema for the manifest."""
+        files = self.streams.get(stream_name)
+        if files is None:
+            self.streams[stream_name] = _StreamFiles(schema, list(key_properties))
+        else:
+            files.schema, files.key_properties = schema, list(key_properties)
+
+    def write_record(self, stream_name: str, record: dict) -> None:
+        """Append a record to the stream's current file, rotating it once it is large enough."""
+        files = self.streams.setdefault(stream_name, _StreamFiles({}, []))
+        current = files.current or self._open(stream_name, files)
+        line = (serialize_json(record) + "\n").encode()
+        current.buffer.append(line)
+        current.buffered += len(line)
+        current.records += 1
+        if current.buffered >= FLUSH_BYTES:
+            self._flush(current)
+            if current.raw.tell() >= self.max_file_bytes:
+                self._complete(files, current)
+
+    def close(self) -> str:
+        """Complete every open file and write the manifest, returning its path."""
+        for files in self.streams.values():
+            if files.current is not None:
+                self._complete(files, files.current)
+        manifest = {
+            "run": self.run,
+            "compression": self.compression,
+            "streams": {
+                name: {"schema": files.schema, "key_properties": files.key_properties, "files": files.files}
+                for name, files in self.streams.items()
+            },
+        }
+        path = os.path.join(self.directory, f"manifest-{self.run}.json")  # noqa: PTH118
+        with open(f"{path}.part", "w") as file:  # noqa: PTH123
+            json.dump(manifest, file, indent=2)
+        os.replace(f"{path}.part", path)  # noqa: PTH105
+        return path
+
+    def _open(self, stream_name: str, files: _StreamFiles) -> _OpenFile:
+        directory = os.path.join(self.directory, stream_name)  # noqa: PTH118
+        os.makedirs(directory, exist_ok=True)  # noqa: PTH103
+        name = f"{stream_name}-{self.run}-{len(files.files):05d}.jsonl{COMPRESSIONS[self.compression]}"
+        path = os.path.join(directory, name)  # noqa: PTH118
+        raw = open(f"{path}.part", "wb")  # noqa: PTH123, SIM115
+        if self.compression == "zstd":
+            import zstandard  # noqa: PLC0415
+
+            writer = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=False)
+        else:
+            writer = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=GZIP_LEVEL, mtime=0)
+        files.current = _OpenFile(path, raw, writer)
+        return files.current
+
+    @staticmethod
+    def _flush(current: _OpenFile) -> None:
+        current.writer.write(b"".join(current.buffer))
+        current.buffer.clear()
+        current.buffered = 0
+
+    def _complete(self, files: _StreamFiles, current: _OpenFile) -> None:
+        self._flush(current)
+        current.writer.close()
+        size = current.raw.tell()
+        current.raw.close()
+        os.replace(f"{current.path}.part", current.path)  # noqa: PTH105
+        files.files.append(
+            {"path": os.path.relpath(current.path, self.directory), "records": current.records, "bytes": size},
+        )
+        files.current = None
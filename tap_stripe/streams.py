@@ -5,20 +5,15 @@ from __future__ import annotations
 import typing as t
 from datetime import datetime
 
-from tap_stripe.client import StripeReportStream, StripeStream
-
-from .schemas import (
-    activity_itemized_2_schema,
-    activity_summary_1_schema,
-    balance_change_from_activity_itemized_2_schema,
-    balance_change_from_activity_summary_1_schema,
-    charges_schema,
-    disputes_schema,
-    exchange_rates_schema,
-    payment_intents_schema,
-    report_runs_schema,
+from tap_stripe.client import (
+    StripeReportStream,
+    StripeSearchStream,
+    StripeStream,
+    StripeSubresourceStream,
 )
 
+from .schemas import LazySchema
+
 if t.TYPE_CHECKING:
     import requests
 
@@ -31,7 +26,7 @@ class ChargesStream(StripeStream):
     replication_key = "created"
     is_sorted = False
 
-    schema = charges_schema
+    schema = LazySchema("charges_schema")
 
 
 class DisputesStream(StripeStream):
@@ -42,7 +37,7 @@ class DisputesStream(StripeStream):
     is_sorted = False
     replication_key = "created"
 
-    schema = disputes_schema
+    schema = LazySchema("disputes_schema")
 
 class PaymentIntentsStream(StripeStream):
     """Stripe payment intents stream class."""
@@ -52,14 +47,75 @@ class PaymentIntentsStream(StripeStream):
     is_sorted = False
     replication_key = "created"
 
-    schema = payment_intents_schema
+    schema = LazySchema("payment_intents_schema")
+
+class BalanceTransactionsStream(StripeStream):
+    """Stripe balance transactions stream class.
+
+    The highest-volume object of an account, so it is split into weekly `created`
+    windows that are paged concurrently, each with its own bookmark.
+    """
+    name = "balance_transactions"
+    path = "/balance_transactions"
+    primary_keys: t.ClassVar[list[str]] = ["id"]
+    replication_key = "created"
+    is_sorted = False
+    window_days = 7
+
+    schema = LazySchema("balance_transactions_schema")
+
+
+class RefundsStream(StripeStream):
+    """Stripe refunds stream class.
+
+    Listed from the top-level endpoint filtered on `created`, instead of per charge.
+    """
+    name = "refunds"
+    path = "/refunds"
+    primary_keys: t.ClassVar[list[str]] = ["id"]
+    replication_key = "created"
+    is_sorted = False
+
+    schema = LazySchema("refunds_schema")
+
+
+class CheckoutSessionLineItemsStream(StripeSubresourceStream):
+    """Stripe checkout session line items stream class."""
+    name = "checkout_session_line_items"
+    parent_path = "/checkout/sessions"
+    parent_key = "checkout_session"
+    subresource = "line_items"
+    primary_keys: t.ClassVar[list[str]] = ["checkout_session", "id"]
+    replication_key = "checkout_session_created"
+
+    schema = LazySchema("checkout_session_line_items_schema")
+
+
+class SourcesStream(StripeSubresourceStream, StripeSearchStream):
+    """Stripe sources stream class.
+
+    Sources can neither be listed account-wide nor searched, so customers are
+    searched by `created` with their sources expanded. A source added to a customer
+    created before the bookmark is only picked up by a full sync.
+    """
+    name = "sources"
+    parent_path = "/customers"
+    parent_key = "customer"
+    subresource = "sources"
+    primary_keys: t.ClassVar[list[str]] = ["id"]
+    replication_key = "customer_created"
+
+    schema = LazySchema("sources_schema")
+
 
 class ExchangeRateStream(StripeStream):
     """Stripe exchange rates stream class."""
     name = "exchange_rates"
     path = "/exchange_rates"
     primary_keys: t.ClassVar[list[str]] = ["send_currency", "receive_currency", "date"]
-    schema = exchange_rates_schema
+    # Every row is dated with the time it was listed.
+    uses_change_index = False
+    schema = LazySchema("exchange_rates_schema")
 
     def parse_response(self, response: requests.Response) -> t.Iterable[dict]:
         """Parse the response and return an iterator of result records.
@@ -73,8 +129,7 @@ class ExchangeRateStream(StripeStream):
         .. _requests.Response:
             https://requests.readthedocs.io/en/latest/api/#requests.Response
         """
-        data = response.json()["data"]
-        for row in data:
+        for row in super().parse_response(response):
             for receive_currency, rate in row["rates"].items():
                 yield {
                     "send_currency": row["id"],
@@ -83,6 +138,16 @@ class ExchangeRateStream(StripeStream):
                     "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),  # noqa: DTZ005
                 }
 
+    def _page_factors(self, page: list[dict]) -> tuple[float, float]:
+        """Return the rates per exchange rate object, each of which becomes a row."""
+        if not page:
+            return 0.0, 0.0
+        return sum(len(obj.get("rates") or {}) for obj in page) / len(page), 0.0
+
+    def _resume_cursor(self, record: dict) -> str:
+        """Return the id of the exchange rate object the row came from, its send currency."""
+        return record["send_currency"]
+
 
 class ReportRunsStream(StripeStream):
     """Stripe report runs base stream class."""
@@ -91,7 +156,7 @@ class ReportRunsStream(StripeStream):
     primary_keys: t.ClassVar[list[str]] = ["id"]
     replication_key = "created"
     is_sorted = False
-    schema = report_runs_schema
+    schema = LazySchema("report_runs_schema")
 
 
 class ActivityItemized2Stream(StripeReportStream):
@@ -104,7 +169,7 @@ class ActivityItemized2Stream(StripeReportStream):
         "fee_id",
         "activity_at",
     ]
-    schema = activity_itemized_2_schema
+    schema = LazySchema("activity_itemized_2_schema")
 
 
 class ActivitySummary1Stream(StripeReportStream):
@@ -112,7 +177,7 @@ class ActivitySummary1Stream(StripeReportStream):
     name = "activity_summary_1"
     original_name = "activity.summary.1"
     id_keys: t.ClassVar[list[str]] = ["reporting_category", "currency", "report_start_at"]
-    schema = activity_summary_1_schema
+    schema = LazySchema("activity_summary_1_schema")
 
 
 class BalanceChangeFromActivityItemized2Stream(StripeReportStream):
@@ -120,7 +185,7 @@ class BalanceChangeFromActivityItemized2Stream(StripeReportStream):
     name = "balance_change_from_activity_itemized_2"
     original_name = "balance_change_from_activity.itemized.2"
     id_keys: t.ClassVar[list[str]] = ["balance_transaction_id", "created_utc"]
-    schema = balance_change_from_activity_itemized_2_schema
+    schema = LazySchema("balance_change_from_activity_itemized_2_schema")
 
 
 class BalanceChangeFromActivitySummary1Stream(StripeReportStream):
@@ -128,4 +193,4 @@ class BalanceChangeFromActivitySummary1Stream(StripeReportStream):
     name = "balance_change_from_activity_summary_1"
     original_name = "balance_change_from_activity.summary.1"
     id_keys: t.ClassVar[list[str]] = ["reporting_category", "currency", "report_start_at"]
-    schema = balance_change_from_activity_summary_1_schema
+    schema = LazySchema("balance_change_from_activity_summary_1_schema")
@@ -2,10 +2,41 @@
 
 from __future__ import annotations
 
+import importlib.util
+import time
+import typing
+
+import click
 from singer_sdk import Tap
+from singer_sdk import _singerlib as singer
 from singer_sdk import typing as th  # JSON schema typing helpers
+from singer_sdk.exceptions import ConfigValidationError
 
 from tap_stripe import streams
+from tap_stripe.changes import ChangeIndex
+from tap_stripe.concurrency import TokenBucket, TTLCache
+from tap_stripe.planning import StreamPlan, format_plan
+from tap_stripe.profiling import PROFILE_MODES, profile_run
+from tap_stripe.sharding import Shard
+from tap_stripe.sink import COMPRESSIONS, FileSink
+
+REPORT_TYPES_TTL = 300
+
+STREAM_TYPES: list[type[streams.StripeStream]] = [
+    streams.ChargesStream,
+    streams.DisputesStream,
+    streams.PaymentIntentsStream,
+    streams.BalanceTransactionsStream,
+    streams.RefundsStream,
+    streams.CheckoutSessionLineItemsStream,
+    streams.SourcesStream,
+    streams.ExchangeRateStream,
+    streams.ReportRunsStream,
+    streams.ActivitySummary1Stream,
+    streams.ActivityItemized2Stream,
+    streams.BalanceChangeFromActivityItemized2Stream,
+    streams.BalanceChangeFromActivitySummary1Stream,
+]
 
 
 class TapStripe(Tap):
@@ -26,25 +57,287 @@ class TapStripe(Tap):
             th.DateTimeType,
             description="The earliest record date to sync",
         ),
+        th.Property(
+            "accounts",
+            th.ArrayType(
+                th.ObjectType(
+                    th.Property(
+                        "id",
+                        th.StringType,
+                        required=True,
+                        description="Connected account id, or a name for an account with its own api_key",
+                    ),
+                    th.Property(
+                        "api_key",
+                        th.StringType,
+                        secret=True,
+                        description="The account's own key; without it, api_key is used with a Stripe-Account header",
+                    ),
+                ),
+            ),
+            description="Sync several accounts in one run, each as a stream partition with its own state",
+        ),
+        th.Property(
+            "account_concurrency",
+            th.IntegerType,
+            default=4,
+            description="Number of partitions (accounts or created windows) fetched concurrently per stream",
+        ),
+        th.Property(
+            "window_days",
+            th.IntegerType,
+            description=(
+                "Split list streams into created windows of this many days, each a partition with its own state. "
+                "Defaults to 7 for balance_transactions, and to 30 for other list streams when sharding without accounts"
+            ),
+        ),
+        th.Property(
+            "shard_count",
+            th.IntegerType,
+            default=1,
+            description="Number of tap processes one sync is split across",
+        ),
+        th.Property(
+            "shard_index",
+            th.IntegerType,
+            default=0,
+            description="Which of the shard_count shards this process syncs, from 0",
+        ),
+        th.Property(
+            "max_requests_per_second",
+            th.NumberType,
+            default=25,
+            description="Request rate budget shared by all streams and accounts",
+        ),
+        th.Property(
+            "report_parse_processes",
+            th.IntegerType,
+            default=1,
+            description="Number of worker processes parsing report files larger than 4 MiB; 1 parses in the tap process",
+        ),
+        th.Property(
+            "prefetch_pages",
+            th.IntegerType,
+            default=2,
+            description="Pages of records each stream fetches ahead of the page being written; 0 fetches on demand",
+        ),
+        th.Property(
+            "hedge_percentile",
+            th.NumberType,
+            description=(
+                "Send a duplicate of a list GET that takes longer than this percentile of its endpoint's recent "
+                "requests, e.g. 95, and use whichever answers first. Duplicates use spare request rate budget only"
+            ),
+        ),
+        th.Property(
+            "change_index_path",
+            th.StringType,
+            description=(
+                "Path of a local SQLite file remembering a content hash of every emitted record. Records a later "
+                "sync finds unchanged, e.g. in lookback re-syncs, are not emitted again. Delete it to emit everything"
+            ),
+        ),
+        th.Property(
+            "deduplicate",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Drop records whose primary key was already emitted in this sync, e.g. by retried pages, "
+                "using about 9 bytes of memory per record"
+            ),
+        ),
+        th.Property(
+            "max_runtime",
+            th.IntegerType,
+            description=(
+                "Seconds after which the sync stops at the next record or report row and writes a STATE that the "
+                "next sync resumes from, keeping each bookmark until its partition is complete"
+            ),
+        ),
+        th.Property(
+            "output_directory",
+            th.StringType,
+            description=(
+                "Write records to compressed JSONL files in this directory instead of stdout, with a manifest of "
+                "the files and schemas. Only the final STATE is written to stdout, once all files are complete"
+            ),
+        ),
+        th.Property(
+            "output_compression",
+            th.StringType,
+            default="gzip",
+            allowed_values=list(COMPRESSIONS),
+            description="Compression of the output_directory files; zstd needs the zstd extra",
+        ),
+        th.Property(
+            "output_file_megabytes",
+            th.IntegerType,
+            default=256,
+            description="Compressed size at which an output_directory file is completed and the next one started",
+        ),
+        th.Property(
+            "metrics_textfile",
+            th.StringType,
+            description=(
+                "Path of a Prometheus textfile to write per-stream request latency, bytes, pages, "
+                "records/sec and section timings to at the end of each stream"
+            ),
+        ),
+        th.Property(
+            "profile_sections",
+            th.BooleanType,
+            default=False,
+            description="Count calls and time spent in download_report, parse_response and post_process per stream",
+        ),
     ).to_dict()
 
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        """Initialize the tap, the state shared by its streams, and its shard."""
+        super().__init__(*args, **kwargs)
+        self.started_at = time.monotonic()
+        self.rate_limiter = TokenBucket(self.config.get("max_requests_per_second", 25))
+        self.report_types: TTLCache[dict[str, dict]] = TTLCache(REPORT_TYPES_TTL)
+        self.shard = Shard(self.config.get("shard_index", 0), self.config.get("shard_count", 1))
+        change_index_path = self.config.get("change_index_path")
+        self.change_index = ChangeIndex(change_index_path) if change_index_path else None
+        self.file_sink: FileSink | None = None
+        if not 0 <= self.shard.index < self.shard.count:
+            msg = f"shard_index must be between 0 and shard_count - 1, got {self.shard.index}"
+            raise ConfigValidationError(msg)
+        windowed = self.config.get("window_days") or (self.shard.count > 1 and not self.config.get("accounts"))
+        if windowed and not self.config.get("start_date"):
+            msg = "start_date is required to split list streams into created windows"
+            raise ConfigValidationError(msg)
+        compression = self.config.get("output_compression", "gzip")
+        if self.config.get("output_directory") and compression == "zstd" and not importlib.util.find_spec("zstandard"):
+            msg = "output_compression zstd needs the zstandard package, e.g. pip install 'tap-stripe[zstd]'"
+            raise ConfigValidationError(msg)
+
+    def runtime_exceeded(self) -> bool:
+        """Whether the tap has been running for longer than `max_runtime`."""
+        max_runtime = self.config.get("max_runtime")
+        return bool(max_runtime) and time.monotonic() - self.started_at >= max_runtime
+
+    def sync_all(self) -> None:
+        """Sync all selected streams, then complete the output files and close the change index.
+
+        With `output_directory`, the final STATE is only written once the manifest is,
+        so it never covers records in files that were not completed.
+        """
+        output_directory = self.config.get("output_directory")
+        if output_directory:
+            self.file_sink = FileSink(
+                output_directory,
+                self.config.get("output_compression", "gzip"),
+                self.config.get("output_file_megabytes", 256) << 20,
+            )
+        try:
+            super().sync_all()
+            if self.file_sink is not None:
+                self.logger.info("Wrote manifest %s", self.file_sink.close())
+                self.file_sink = None
+                self.write_message(singer.StateMessage(value=self.state))
+        finally:
+            self.file_sink = None
+            if self.change_index is not None:
+                self.change_index.close()
+
+    def write_message(self, message: singer.Message) -> None:
+        """Write a message to stdout, or its records and schema to the output files if configured.
+
+        The change index is committed once a STATE message reaches stdout, so its hashes
+        never cover records the target has no state for.
+        """
+        if self.file_sink is not None and isinstance(message, singer.RecordMessage):
+            self.file_sink.write_record(message.stream, message.record)
+        elif self.file_sink is not None and isinstance(message, singer.SchemaMessage):
+            self.file_sink.write_schema(message.stream, message.schema, message.key_properties or [])
+        elif self.file_sink is None or not isinstance(message, singer.StateMessage):
+            super().write_message(message)
+            if isinstance(message, singer.StateMessage) and self.change_index is not None:
+                self.change_index.commit()
+
+    def plan(self) -> list[StreamPlan]:
+        """Estimate the cost of syncing every selected stream, without emitting any messages."""
+        return [stream.plan() for stream in self.streams.values() if stream.selected]
+
+    @classmethod
+    def get_singer_command(cls) -> click.Command:
+        """Add the planning and profiling options to the standard tap command."""
+        command = super().get_singer_command()
+        command.params.extend(
+            [
+                click.Option(
+                    ["--plan"],
+                    help="Print the estimated requests, report runs, bytes and runtime of the sync instead of running it.",
+                    is_flag=True,
+                ),
+                click.Option(
+                    ["--profile"],
+                    help="Profile the sync and write the result to this path. Supports {pid} and {timestamp}.",
+                    type=click.Path(),
+                ),
+                click.Option(
+                    ["--profile-mode"],
+                    help="cprofile writes a pstats file, sampling writes collapsed stacks for flame graphs.",
+                    type=click.Choice(PROFILE_MODES),
+                    default=PROFILE_MODES[0],
+                ),
+            ],
+        )
+        return command
+
+    @classmethod
+    def invoke(  # type: ignore[override]
+        cls,
+        *,
+        plan: bool = False,
+        profile: str | None = None,
+        profile_mode: str = PROFILE_MODES[0],
+        **kwargs: typing.Any,
+    ) -> None:
+        """Invoke the tap, printing its plan with `--plan`, or profiling the whole run if `--profile` is given."""
+        if plan:
+            config_files, parse_env_config = cls.config_from_cli_args(*kwargs.get("config", ()))
+            tap = cls(
+                config=config_files,  # type: ignore[arg-type]
+                state=kwargs.get("state"),
+                catalog=kwargs.get("catalog"),
+                parse_env_config=parse_env_config,
+                validate_config=True,
+            )
+            click.echo(format_plan(tap.plan(), tap.config.get("max_requests_per_second", 25)))
+            return
+        if not profile:
+            super().invoke(**kwargs)
+            return
+        with profile_run(profile, profile_mode):
+            super().invoke(**kwargs)
+
     def discover_streams(self) -> list[streams.StripeStream]:
         """Return a list of discovered streams.
 
+        When the tap runs with a catalog, only the streams the catalog selects (and
+        their parents) are instantiated, so single-stream runs skip building the other
+        streams' schemas and metadata.
+
         Returns:
             A list of discovered streams.
         """
-        return [
-            streams.ChargesStream(self),
-            streams.DisputesStream(self),
-            streams.PaymentIntentsStream(self),
-            streams.ExchangeRateStream(self),
-            streams.ReportRunsStream(self),
-            streams.ActivitySummary1Stream(self),
-            streams.ActivityItemized2Stream(self),
-            streams.BalanceChangeFromActivityItemized2Stream(self),
-            streams.BalanceChangeFromActivitySummary1Stream(self),
-        ]
+        return [stream_type(self) for stream_type in STREAM_TYPES if self._needs_stream_type(stream_type)]
+
+    def _needs_stream_type(self, stream_type: type[streams.StripeStream]) -> bool:
+        """Whether a stream type is selected in the input catalog, or is the parent of one that is."""
+        if self.input_catalog is None:
+            return True
+        entry = self.input_catalog.get_stream(stream_type.name)
+        if entry is None or entry.metadata.resolve_selection()[()]:
+            return True
+        return any(
+            child_type.parent_stream_type is stream_type and self._needs_stream_type(child_type)
+            for child_type in STREAM_TYPES
+        )
+
 
 
 if __name__ == "__main__":
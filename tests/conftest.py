@@ -1,3 +1,126 @@
 """Test Configuration."""
 
+from __future__ import annotations
+
+import contextlib
+import io
+import typing
+
+import pytest
+
+from tap_stripe import streams
+from tap_stripe.tap import TapStripe
+from tests.fake_stripe import FakeStripe
+from tests.synthetic import START_TIMESTAMP, generate_objects, report_csv
+
 pytest_plugins = ("singer_sdk.testing.pytest_plugin",)
+
+START_DATE = "2024-01-01T00:00:00Z"
+REPORT_STREAMS = (
+    streams.ActivityItemized2Stream,
+    streams.ActivitySummary1Stream,
+    streams.BalanceChangeFromActivityItemized2Stream,
+    streams.BalanceChangeFromActivitySummary1Stream,
+)
+
+
+@pytest.fixture
+def fake_stripe() -> FakeStripe:
+    """Return a fake Stripe API populated with a few pages of every stream."""
+    fake = FakeStripe()
+    fake.add_objects("/charges", generate_objects("charges", 250))
+    fake.add_objects("/disputes", generate_objects("disputes", 120))
+    fake.add_objects("/payment_intents", generate_objects("payment_intents", 250))
+    fake.add_objects("/balance_transactions", generate_objects("balance_transactions", 250, spacing=3600))
+    fake.add_objects("/refunds", generate_objects("refunds", 250))
+    add_checkout_sessions(fake, [3] * 28 + [25] * 2)
+    add_customers_with_sources(fake, [1] * 140 + [12] * 10)
+    fake.add_objects(
+        "/exchange_rates",
+        [{"id": currency, "object": "exchange_rate", "rates": {"usd": 1.1, "gbp": 0.85}} for currency in ("eur", "nok")],
+    )
+    fake.add_objects("/reporting/report_runs", [])
+    for stream_class in REPORT_STREAMS:
+        content = report_csv(stream_class.name, 500)
+        fake.add_report(stream_class.original_name, START_TIMESTAMP, START_TIMESTAMP + 86400, lambda content=content: content)
+    return fake
+
+
+def add_checkout_sessions(fake: FakeStripe, line_item_counts: list[int], *, seed: int = 0) -> None:
+    """Register one checkout session per entry of `line_item_counts`, with that many line items each."""
+    sessions = []
+    for i, count in enumerate(line_item_counts):
+        session_id = f"cs_{i:014d}"
+        sessions.append({"id": session_id, "object": "checkout.session", "created": START_TIMESTAMP + i + 1})
+        fake.add_objects(
+            f"/checkout/sessions/{session_id}/line_items",
+            generate_objects("checkout_session_line_items", count, seed=seed + i),
+        )
+    fake.add_objects("/checkout/sessions", sessions)
+
+
+def add_customers_with_sources(fake: FakeStripe, source_counts: list[int]) -> None:
+    """Register one customer per entry of `source_counts`, with that many sources each."""
+    customers = []
+    for i, count in enumerate(source_counts):
+        customer_id = f"cus_{i:014d}"
+        customers.append({"id": customer_id, "object": "customer", "created": START_TIMESTAMP + i + 1})
+        sources = generate_objects("sources", count, seed=i)
+        fake.add_objects(
+            f"/customers/{customer_id}/sources",
+            [{**source, "id": f"src_{i:06d}_{j:04d}", "customer": customer_id} for j, source in enumerate(sources)],
+        )
+    fake.add_objects("/customers", customers)
+
+
+@pytest.fixture
+def make_tap(fake_stripe: FakeStripe) -> typing.Callable[..., TapStripe]:
+    """Return a factory for taps that talk to `fake_stripe`, which has no rate limit."""
+
+    def factory(state: dict | None = None, catalog: dict | None = None, **config: typing.Any) -> TapStripe:
+        config = {"api_key": "sk_test_fake", "start_date": START_DATE, "max_requests_per_second": 1000, **config}
+        tap = TapStripe(config=config, state=state, catalog=catalog)
+        return fake_stripe.install(tap)
+
+    return factory
+
+
+def select_streams(*stream_names: str) -> dict:
+    """Return a discovered catalog with only the named streams selected."""
+    catalog = TapStripe(config={"api_key": "sk_test_fake"}, setup_mapper=False).catalog_dict
+    for entry in catalog["streams"]:
+        for metadata in entry["metadata"]:
+            if not metadata["breadcrumb"]:
+                metadata["metadata"]["selected"] = entry["tap_stream_id"] in stream_names
+    return catalog
+
+
+class RecordSink(io.StringIO):
+    """Stdout replacement counting the RECORD messages written to it."""
+
+    def __init__(self) -> None:  # noqa: D107
+        super().__init__()
+        self.records = 0
+        self.messages: list[str] = []
+
+    def write(self, text: str) -> int:  # noqa: D102
+        if text.startswith('{"type":"RECORD"'):
+            self.records += 1
+        elif text.strip():
+            self.messages.append(text)
+        return len(text)
+
+
+@pytest.fixture
+def sync_stream() -> typing.Callable[[TapStripe, str], RecordSink]:
+    """Return a helper that syncs one stream of a tap with stdout captured."""
+
+    def sync(tap: TapStripe, stream_name: str) -> RecordSink:
+        sink = RecordSink()
+        with contextlib.redirect_stdout(sink):
+            stream = tap.streams[stream_name]
+            stream.sync()
+            stream.finalize_state_progress_markers()
+        return sink
+
+    return sync
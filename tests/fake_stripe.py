@@ -0,0 +1,337 @@
+"""Offline stand-in for the Stripe API, served through a `requests` transport adapter."""
+
+from __future__ import annotations
+
+import base64
+import csv
+import io
+import json
+import re
+import threading
+import time
+import typing
+from collections import Counter
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlsplit
+
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+if typing.TYPE_CHECKING:
+    from requests import PreparedRequest
+    from singer_sdk.tap_base import Tap
+
+API_PREFIX = "/v1"
+FILES_HOST = "files.stripe.com"
+
+
+class FakeStripe(BaseAdapter):
+    """Serve synthetic list pages, report runs and report files without a network.
+
+    Mount it on the requests session of every stream with `install`, register data with
+    `add_objects` and `add_report`, then run the tap as usual. Every request is counted
+    per path in `requests`, per account in `accounts` and the size of every response
+    body in `bytes_sent`. Objects and report runs can be scoped to an account, chosen by
+    the `Stripe-Account` header or else by the api key through `key_accounts`; other
+    requests see the platform account, `None`. POSTs with a previously seen
+    `Idempotency-Key` get the original response again. `expand[]=data.<field>` embeds
+    the first page of the objects registered under `<path>/<id>/<field>`, and
+    `<path>/search` answers `created` queries over the objects of `<path>`.
+    """
+
+    def __init__(self, *, latency: float = 0.0, report_pending_polls: int = 0) -> None:
+        """Create an empty fake API.
+
+        Args:
+            latency: Seconds to sleep before answering each request.
+            report_pending_polls: Number of polls a new report run stays `pending` for.
+
+        Extra delays for the next requests to a path can be queued in `delays`, e.g.
+        `delays["/v1/charges"] = [0, 0, 5.0]` stalls the third request for five seconds.
+        """
+        super().__init__()
+        self.latency = latency
+        self.delays: dict[str, list[float]] = {}
+        self.report_pending_polls = report_pending_polls
+        self.objects: dict[str, list[dict]] = {}
+        self.account_objects: dict[str, dict[str, list[dict]]] = {}
+        self.key_accounts: dict[str, str] = {}
+        self.idempotent_responses: dict[str, tuple[int, bytes]] = {}
+        self.reports: dict[str, dict[str, typing.Any]] = {}
+        self.report_runs: list[dict] = []
+        self.files: dict[str, typing.Callable[[], bytes | typing.BinaryIO]] = {}
+        self.requests: Counter[str] = Counter()
+        self.bytes_sent: Counter[str] = Counter()
+        self.accounts: Counter[str | None] = Counter()
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._polls: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def add_objects(self, path: str, records: typing.Iterable[dict], account: str | None = None) -> None:
+        """Register the objects served by a list endpoint, e.g. `/charges`, optionally for one connected account."""
+        scope = self.objects if account is None else self.account_objects.setdefault(account, {})
+        objects = scope.setdefault(path, [])
+        objects.extend(records)
+        objects.sort(key=lambda record: record.get("created", 0), reverse=True)
+
+    def add_report(
+        self,
+        report_type: str,
+        data_available_start: int,
+        data_available_end: int,
+        content: typing.Callable[[], bytes | typing.BinaryIO],
+    ) -> None:
+        """Register a report type and a factory for the CSV file its runs produce.
+
+        The factory may return the whole file as bytes or an open binary file, which is
+        then streamed to the client so large reports never have to fit in memory.
+        """
+        self.reports[report_type] = {
+            "id": report_type,
+            "object": "reporting.report_type",
+            "data_available_start": data_available_start,
+            "data_available_end": data_available_end,
+            "content": content,
+        }
+
+    def install(self, tap: Tap) -> Tap:
+        """Route all HTTPS traffic of the tap's streams to this fake."""
+        for stream in tap.streams.values():
+            stream.requests_session.mount("https://", self)
+        return tap
+
+    @property
+    def total_requests(self) -> int:
+        """Return the number of requests served so far."""
+        return sum(self.requests.values())
+
+    def send(self, request: PreparedRequest, **kwargs: typing.Any) -> Response:  # noqa: ARG002
+        """Answer a prepared request the way the Stripe API would."""
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            delays = self.delays.get(urlsplit(request.url).path)
+            delay = self.latency + (delays.pop(0) if delays else 0.0)
+        try:
+            if delay:
+                time.sleep(delay)
+            with self._lock:
+                return self._respond(request)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _respond(self, request: PreparedRequest) -> Response:
+        url = urlsplit(request.url)
+        query = parse_qsl(url.query)
+        params: dict[str, typing.Any] = dict(query)
+        for key in ("parameters[columns][]", "expand[]"):
+            params[key] = [value for name, value in query if name == key]
+        path = url.path
+        account = request.headers.get("Stripe-Account") or self._key_account(request.headers.get("Authorization"))
+        self.requests[path] += 1
+        self.accounts[account] += 1
+
+        idempotency_key = request.headers.get("Idempotency-Key") if request.method == "POST" else None
+        if idempotency_key in self.idempotent_responses:
+            status, body = self.idempotent_responses[idempotency_key]
+        elif url.hostname == FILES_HOST:
+            status, body = self._file(path)
+        elif not path.startswith(API_PREFIX):
+            status, body = 404, self._error("Unrecognized request URL")
+        else:
+            status, body = self._route(request.method or "GET", path[len(API_PREFIX) :], params, account)
+            if idempotency_key:
+                self.idempotent_responses[idempotency_key] = (status, body)
+        if isinstance(body, bytes):
+            body = io.BytesIO(body)
+        size = body.seek(0, io.SEEK_END)
+        body.seek(0)
+        self.bytes_sent[path] += size
+        return self._build_response(request, status, body, size)
+
+    def _key_account(self, authorization: str | None) -> str | None:
+        if not authorization or not authorization.startswith("Basic "):
+            return None
+        api_key = base64.b64decode(authorization[len("Basic ") :]).decode().split(":", 1)[0]
+        return self.key_accounts.get(api_key)
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+    def _route(self, method: str, path: str, params: dict[str, typing.Any], account: str | None) -> tuple[int, bytes]:
+        if path == "/reporting/report_runs" and method == "POST":
+            return 200, self._json(self._issue_run(params, account))
+        if path.startswith("/reporting/report_runs/"):
+            return self._report_run(path.rsplit("/", 1)[-1])
+        if path == "/reporting/report_runs":
+            runs = [self._public_run(run) for run in self.report_runs if run["_account"] == account]
+            return 200, self._json(self._list(runs, params))
+        if path == "/reporting/report_types":
+            report_types = [self._report_type(name) for name in self.reports]
+            return 200, self._json({"object": "list", "data": report_types, "has_more": False, "url": path})
+        if path.startswith("/reporting/report_types/"):
+            report_type = path.rsplit("/", 1)[-1]
+            if report_type not in self.reports:
+                return 404, self._error(f"No such report type: {report_type}")
+            return 200, self._json(self._report_type(report_type))
+        objects = self.objects if account is None else self.account_objects.get(account, {})
+        search = path.endswith("/search")
+        if search:
+            path = path[: -len("/search")]
+        if path in objects:
+            page = self._search(objects[path], params) if search else self._list(objects[path], params)
+            for field in (expand[len("data.") :] for expand in params["expand[]"] if expand.startswith("data.")):
+                page["data"] = [
+                    {**obj, field: self._list(objects.get(f"{path}/{obj['id']}/{field}", []), {})}
+                    for obj in page["data"]
+                ]
+            return 200, self._json(page)
+        return 404, self._error("Unrecognized request URL")
+
+    def _list(self, objects: list[dict], params: dict[str, typing.Any]) -> dict:
+        """Paginate newest-first like Stripe list endpoints do."""
+        limit = int(params.get("limit", 10))
+        created = {
+            operator: int(params[f"created[{operator}]"])
+            for operator in ("gt", "gte", "lt")
+            if f"created[{operator}]" in params
+        }
+        starting_after = params.get("starting_after")
+        start = 0
+        if starting_after:
+            start = next((i + 1 for i, obj in enumerate(objects) if obj.get("id") == starting_after), len(objects))
+        page = []
+        for obj in objects[start:]:
+            if not self._matches_created(obj.get("created", 0), created):
+                continue
+            page.append(obj)
+            if len(page) > limit:
+                break
+        return {"object": "list", "data": page[:limit], "has_more": len(page) > limit, "url": ""}
+
+    def _search(self, objects: list[dict], params: dict[str, typing.Any]) -> dict:
+        """Answer a Search API query made of `created` comparisons joined by `AND`."""
+        limit = int(params.get("limit", 10))
+        created: dict[str, int] = {}
+        for clause in params["query"].split(" AND "):
+            match = re.fullmatch(r"created(>=|>|<)(\d+)", clause.strip())
+            if match is None:
+                msg = f"Unsupported search clause: {clause}"
+                raise ValueError(msg)
+            created[{">=": "gte", ">": "gt", "<": "lt"}[match[1]]] = int(match[2])
+        matches = [obj for obj in objects if self._matches_created(obj.get("created", 0), created)]
+        offset = int(params.get("page", 0))
+        has_more = offset + limit < len(matches)
+        return {
+            "object": "search_result",
+            "data": matches[offset : offset + limit],
+            "has_more": has_more,
+            "next_page": str(offset + limit) if has_more else None,
+            "url": "",
+        }
+
+    @staticmethod
+    def _matches_created(value: int, created: dict[str, int]) -> bool:
+        return (
+            value > created.get("gt", value - 1)
+            and value >= created.get("gte", value)
+            and value < created.get("lt", value + 1)
+        )
+
+    def _report_type(self, report_type: str) -> dict:
+        return {key: value for key, value in self.reports[report_type].items() if key != "content"}
+
+    def _issue_run(self, params: dict[str, typing.Any], account: str | None) -> dict:
+        report_type = params["report_type"]
+        run_id = f"frr_{len(self.report_runs) + 1:08d}"
+        file_id = f"file_{run_id}"
+        columns = params["parameters[columns][]"]
+        content = self.reports[report_type]["content"]
+        self.files[file_id] = (lambda: self._select_columns(content(), columns)) if columns else content
+        run = {
+            "id": run_id,
+            "object": "reporting.report_run",
+            "created": int(time.time()),
+            "livemode": False,
+            "report_type": report_type,
+            "parameters": {
+                "interval_start": int(params["parameters[interval_start]"]),
+                "interval_end": int(params["parameters[interval_end]"]),
+                **({"columns": columns} if columns else {}),
+            },
+            "status": "pending",
+            "result": None,
+            "_file_id": file_id,
+            "_account": account,
+        }
+        self.report_runs.insert(0, run)
+        return self._public_run(run)
+
+    @staticmethod
+    def _select_columns(content: bytes | typing.BinaryIO, columns: list[str]) -> bytes:
+        """Keep only `columns` of a report file, the way a run with `parameters[columns]` would."""
+        text = (content if isinstance(content, bytes) else content.read()).decode()
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(csv.DictReader(io.StringIO(text, newline="")))
+        return output.getvalue().encode()
+
+    def _report_run(self, run_id: str) -> tuple[int, bytes]:
+        run = next((run for run in self.report_runs if run["id"] == run_id), None)
+        if run is None:
+            return 404, self._error(f"No such report run: {run_id}")
+        self._polls[run_id] += 1
+        if run["status"] == "pending" and self._polls[run_id] > self.report_pending_polls:
+            run["status"] = "succeeded"
+            run["succeeded_at"] = int(time.time())
+            run["result"] = {
+                "id": run["_file_id"],
+                "object": "file",
+                "purpose": "finance_report_run",
+                "size": self._file_size(run["_file_id"]),
+                "url": f"https://{FILES_HOST}/v1/files/{run['_file_id']}/contents",
+            }
+        return 200, self._json(self._public_run(run))
+
+    def _file_size(self, file_id: str) -> int:
+        content = self.files[file_id]()
+        if isinstance(content, bytes):
+            return len(content)
+        size = content.seek(0, io.SEEK_END)
+        content.close()
+        return size
+
+    @staticmethod
+    def _public_run(run: dict) -> dict:
+        return {key: value for key, value in run.items() if not key.startswith("_")}
+
+    def _file(self, path: str) -> tuple[int, bytes | typing.BinaryIO]:
+        file_id = path.split("/")[3] if path.count("/") >= 3 else ""  # noqa: PLR2004
+        if file_id not in self.files:
+            return 404, self._error(f"No such file: {file_id}")
+        return 200, self.files[file_id]()
+
+    @staticmethod
+    def _json(payload: dict) -> bytes:
+        return json.dumps(payload).encode()
+
+    @classmethod
+    def _error(cls, message: str) -> bytes:
+        return cls._json({"error": {"type": "invalid_request_error", "message": message}})
+
+    @staticmethod
+    def _build_response(request: PreparedRequest, status: int, body: typing.BinaryIO, size: int) -> Response:
+        response = Response()
+        response.status_code = status
+        response.reason = "OK" if status < 400 else "Not Found"  # noqa: PLR2004
+        response.headers = CaseInsensitiveDict({"Content-Length": str(size)})
+        response.raw = body
+        response.url = request.url or ""
+        response.request = request
+        response.encoding = "utf-8"
+        response.elapsed = timedelta(0)
+        return response
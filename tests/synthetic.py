@@ -0,0 +1,225 @@
+"""Schema-conformant synthetic Stripe objects and report files for scale testing.
+
+Values are derived from the JSON schemas in `tap_stripe.schemas`, so generated data
+follows the schemas as they evolve. Generation is deterministic for a given seed and
+streams row by row, so report files with millions of rows can be written to disk
+without holding them in memory::
+
+    python -m tests.synthetic report activity_itemized_2 1000000 itemized.csv
+    python -m tests.synthetic objects charges 100000 charges.jsonl
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import random
+import string
+import sys
+import typing
+from datetime import datetime, timezone
+
+from tap_stripe import schemas
+
+if typing.TYPE_CHECKING:
+    from pathlib import Path
+
+Generator = typing.Callable[[random.Random], typing.Any]
+
+START_TIMESTAMP = 1704067200
+CURRENCIES = ("eur", "usd", "gbp", "nok", "sek", "dkk", "pln", "chf")
+REPORTING_CATEGORIES = ("charge", "refund", "fee", "dispute", "payout", "transfer", "adjustment")
+OBJECT_PREFIXES = {
+    "charges": "ch",
+    "disputes": "dp",
+    "payment_intents": "pi",
+    "balance_transactions": "txn",
+    "refunds": "re",
+    "checkout_session_line_items": "li",
+    "sources": "src",
+    "report_runs": "frr",
+}
+REPORT_GENERATED_COLUMNS = ("report_start_at", "report_end_at", "loaded_at")
+
+
+class Shape(typing.NamedTuple):
+    """Knobs for the size and sparsity of generated values."""
+
+    null_probability: float = 0.2
+    string_length: int = 12
+    array_length: int = 2
+
+
+def _types(schema: dict) -> list[str]:
+    types = schema.get("type", ["string"])
+    return [types] if isinstance(types, str) else list(types)
+
+
+def compile_generator(schema: dict, shape: Shape = Shape(), name: str = "") -> Generator:  # noqa: B008, C901
+    """Compile a JSON schema into a function producing one conformant value per call."""
+    types = _types(schema)
+    nullable = "null" in types
+    kind = next((kind for kind in types if kind != "null"), "null")
+    generate: Generator
+
+    if kind == "object":
+        fields = [(key, compile_generator(sub, shape, key)) for key, sub in schema.get("properties", {}).items()]
+
+        def generate(rng: random.Random) -> dict:
+            return {key: field(rng) for key, field in fields}
+
+    elif kind == "array":
+        item = compile_generator(schema.get("items", {}), shape, name)
+
+        def generate(rng: random.Random) -> list:
+            return [item(rng) for _ in range(rng.randint(0, shape.array_length))]
+
+    elif kind == "integer":
+
+        def generate(rng: random.Random) -> int:
+            return rng.randint(0, 100_000)
+
+    elif kind == "number":
+
+        def generate(rng: random.Random) -> float:
+            return round(rng.uniform(-1000, 1000), 2)
+
+    elif kind == "boolean":
+
+        def generate(rng: random.Random) -> bool:
+            return rng.random() < 0.5  # noqa: PLR2004
+
+    elif schema.get("format") == "date-time":
+
+        def generate(rng: random.Random) -> str:
+            moment = datetime.fromtimestamp(START_TIMESTAMP + rng.randint(0, 365 * 86400), tz=timezone.utc)
+            return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    elif name == "currency" or name.endswith("_currency"):
+
+        def generate(rng: random.Random) -> str:
+            return rng.choice(CURRENCIES)
+
+    elif name.endswith("reporting_category"):
+
+        def generate(rng: random.Random) -> str:
+            return rng.choice(REPORTING_CATEGORIES)
+
+    elif kind == "string":
+        alphabet = string.ascii_letters + string.digits
+
+        def generate(rng: random.Random) -> str:
+            return "".join(rng.choices(alphabet, k=shape.string_length))
+
+    else:
+
+        def generate(rng: random.Random) -> None:  # noqa: ARG001
+            return None
+
+    if not nullable or not shape.null_probability:
+        return generate
+
+    def generate_nullable(rng: random.Random) -> typing.Any:  # noqa: ANN401
+        return None if rng.random() < shape.null_probability else generate(rng)
+
+    return generate_nullable
+
+
+def generate_objects(
+    stream_name: str,
+    count: int,
+    *,
+    seed: int = 0,
+    shape: Shape = Shape(),  # noqa: B008
+    start: int = START_TIMESTAMP,
+    spacing: int = 1,
+) -> typing.Iterator[dict]:
+    """Yield `count` objects matching `<stream_name>_schema`, oldest first.
+
+    Every object gets a unique sortable `id` and a `created` timestamp `spacing` seconds
+    after the previous one, starting one step after `start`.
+    """
+    schema = getattr(schemas, f"{stream_name}_schema")
+    generate = compile_generator(schema, shape)
+    prefix = OBJECT_PREFIXES.get(stream_name, stream_name[:3])
+    rng = random.Random(seed)
+    for i in range(count):
+        obj = generate(rng)
+        obj["id"] = f"{prefix}_{i:014d}"
+        obj["object"] = stream_name.rstrip("s")
+        if "created" in schema["properties"]:
+            obj["created"] = start + (i + 1) * spacing
+        yield obj
+
+
+def report_columns(stream_name: str) -> list[str]:
+    """Return the CSV columns Stripe delivers for a report stream's report type."""
+    schema = getattr(schemas, f"{stream_name}_schema")
+    generated = {*REPORT_GENERATED_COLUMNS, f"{stream_name}_id"}
+    return [column for column in schema["properties"] if column not in generated]
+
+
+def _csv_value(value: typing.Any) -> str:  # noqa: ANN401
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, str) and value.endswith("Z") and "T" in value:
+        return value.replace("T", " ")[:-1]
+    return str(value)
+
+
+def generate_report_rows(
+    stream_name: str,
+    rows: int,
+    *,
+    seed: int = 0,
+    shape: Shape = Shape(),  # noqa: B008
+) -> typing.Iterator[list[str]]:
+    """Yield the header and `rows` data rows of a report CSV, formatted the way Stripe does."""
+    schema = getattr(schemas, f"{stream_name}_schema")
+    columns = report_columns(stream_name)
+    fields = [compile_generator(schema["properties"][column], shape, column) for column in columns]
+    rng = random.Random(seed)
+    yield columns
+    for i in range(rows):
+        row = [_csv_value(field(rng)) for field in fields]
+        for position, column in enumerate(columns):
+            if column.endswith("_id") and row[position]:
+                row[position] = f"{column[:-3]}_{i:010d}"
+        yield row
+
+
+def write_report_csv(target: typing.IO[str], stream_name: str, rows: int, **kwargs: typing.Any) -> None:
+    """Stream a report CSV into an open text file."""
+    csv.writer(target).writerows(generate_report_rows(stream_name, rows, **kwargs))
+
+
+def report_csv(stream_name: str, rows: int, **kwargs: typing.Any) -> bytes:
+    """Return a whole report CSV in memory, for small fixtures."""
+    buffer = io.StringIO()
+    write_report_csv(buffer, stream_name, rows, **kwargs)
+    return buffer.getvalue().encode()
+
+
+def report_csv_file(path: Path, stream_name: str, rows: int, **kwargs: typing.Any) -> typing.Callable[[], typing.BinaryIO]:
+    """Write a report CSV to `path` once and return a factory opening it for `FakeStripe`."""
+    with path.open("w", newline="") as target:
+        write_report_csv(target, stream_name, rows, **kwargs)
+    return lambda: path.open("rb")
+
+
+def main(argv: list[str]) -> None:
+    """Write synthetic report CSVs or JSONL objects from the command line."""
+    kind, stream_name, count, output = argv
+    with open(output, "w", newline="") as target:  # noqa: PTH123
+        if kind == "report":
+            write_report_csv(target, stream_name, int(count))
+        else:
+            for obj in generate_objects(stream_name, int(count)):
+                target.write(json.dumps(obj) + "\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,64 @@
+"""Multi-account syncs against `FakeStripe`."""
+
+from __future__ import annotations
+
+import time
+
+from tap_stripe.concurrency import TokenBucket
+from tests.synthetic import generate_objects
+
+ACCOUNTS = [{"id": "acct_1Connected0001"}, {"id": "acct_1Connected0002"}, {"id": "emea", "api_key": "sk_test_emea"}]
+
+
+def add_account_charges(fake_stripe, counts):  # noqa: ANN001, ANN201
+    """Give every account its own charges, with ids prefixed by the account."""
+    fake_stripe.key_accounts["sk_test_emea"] = "emea"
+    for account, count in zip([account["id"] for account in ACCOUNTS], counts):
+        charges = [{**charge, "id": f"{account}_{charge['id']}"} for charge in generate_objects("charges", count)]
+        fake_stripe.add_objects("/charges", charges, account=account)
+
+
+def test_accounts_are_partitions_with_their_own_state(fake_stripe, make_tap, sync_stream):  # noqa: ANN001, ANN201
+    """Every account is synced with its own credentials and bookmarked separately."""
+    add_account_charges(fake_stripe, [150, 20, 5])
+    tap = make_tap(accounts=ACCOUNTS)
+
+    sink = sync_stream(tap, "charges")
+
+    assert sink.records == 175
+    assert fake_stripe.accounts == {"acct_1Connected0001": 2, "acct_1Connected0002": 1, "emea": 1}
+    partitions = tap.state["bookmarks"]["charges"]["partitions"]
+    assert [partition["context"] for partition in partitions] == [{"account_id": account["id"]} for account in ACCOUNTS]
+    assert all(partition["replication_key_value"] for partition in partitions)
+    assert '"account_id":' in "".join(sink.messages)
+
+
+def test_accounts_are_fetched_concurrently(fake_stripe, make_tap, sync_stream):  # noqa: ANN001, ANN201
+    """Accounts overlap up to `account_concurrency`, and run one at a time when it is 1."""
+    add_account_charges(fake_stripe, [250, 250, 250])
+    fake_stripe.latency = 0.02
+
+    assert sync_stream(make_tap(accounts=ACCOUNTS, account_concurrency=3), "charges").records == 750
+    assert fake_stripe.max_in_flight > 1
+
+    fake_stripe.max_in_flight = 0
+    assert sync_stream(make_tap(accounts=ACCOUNTS, account_concurrency=1), "charges").records == 750
+    assert fake_stripe.max_in_flight == 1
+
+
+def test_report_stream_runs_a_report_per_account(fake_stripe, make_tap, sync_stream):  # noqa: ANN001, ANN201
+    """Report runs are issued per account and the row ids include the account."""
+    tap = make_tap(accounts=ACCOUNTS[:2])
+
+    assert sync_stream(tap, "activity_summary_1").records == 1000
+    assert {run["_account"] for run in fake_stripe.report_runs} == {"acct_1Connected0001", "acct_1Connected0002"}
+
+
+def test_token_bucket_limits_the_request_rate():  # noqa: ANN201
+    """After the initial burst, tokens are handed out at the configured rate."""
+    bucket = TokenBucket(rate=50, capacity=1)
+    started = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+
+    assert time.monotonic() - started >= 0.09
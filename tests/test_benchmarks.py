@@ -0,0 +1,147 @@
+"""Offline throughput benchmarks for every stream, run against `FakeStripe`."""
+
+from __future__ import annotations
+
+import logging
+import resource
+import time
+import tracemalloc
+
+import pytest
+from singer_sdk.helpers._catalog import pop_deselected_record_properties
+from singer_sdk.helpers._typing import TypeConformanceLevel, conform_record_data_types
+
+from tap_stripe.conform import compile_conformer
+from tap_stripe.tap import TapStripe
+from tests.conftest import REPORT_STREAMS, select_streams
+from tests.synthetic import START_TIMESTAMP, generate_objects, report_csv_file
+
+pytest.importorskip("pytest_benchmark")
+
+STREAM_NAMES = [
+    "charges",
+    "disputes",
+    "payment_intents",
+    "balance_transactions",
+    "refunds",
+    "checkout_session_line_items",
+    "sources",
+    "exchange_rates",
+    *(stream_class.name for stream_class in REPORT_STREAMS),
+]
+
+
+@pytest.mark.parametrize("stream_name", STREAM_NAMES)
+def test_stream_throughput(benchmark, fake_stripe, make_tap, sync_stream, stream_name):  # noqa: ANN001, ANN201
+    """Measure records/sec, peak memory and request count of a full sync of one stream."""
+    results = []
+
+    def run(tap):  # noqa: ANN001, ANN202
+        requests_before = fake_stripe.total_requests
+        tracemalloc.start()
+        started = time.perf_counter()
+        sink = sync_stream(tap, stream_name)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results.append((sink.records, elapsed, peak, fake_stripe.total_requests - requests_before))
+
+    benchmark.pedantic(run, setup=lambda: ((make_tap(),), {}), rounds=3)
+
+    records, elapsed, peak, request_count = results[-1]
+    benchmark.extra_info.update(
+        {
+            "records": records,
+            "records_per_sec": round(records / elapsed, 1),
+            "requests": request_count,
+            "peak_traced_bytes": peak,
+            "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        },
+    )
+    assert records > 0
+    assert request_count > 0
+
+
+@pytest.mark.parametrize("processes", [1, 4])
+def test_large_report_throughput(benchmark, fake_stripe, make_tap, sync_stream, tmp_path, processes):  # noqa: ANN001, ANN201
+    """Measure a file-backed `activity.itemized.2` report of production-like width, parsed by 1 or 4 processes."""
+    rows = 20_000
+    content = report_csv_file(tmp_path / "itemized.csv", "activity_itemized_2", rows)
+    fake_stripe.add_report("activity.itemized.2", START_TIMESTAMP, START_TIMESTAMP + 86400, content)
+
+    sink = benchmark.pedantic(
+        lambda tap: sync_stream(tap, "activity_itemized_2"),
+        setup=lambda: ((make_tap(report_parse_processes=processes),), {}),
+        rounds=1,
+    )
+
+    benchmark.extra_info["report_bytes"] = fake_stripe.bytes_sent["/v1/files/file_frr_00000001/contents"]
+    assert sink.records == rows
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_large_balance_transactions_throughput(benchmark, fake_stripe, make_tap, sync_stream, concurrency):  # noqa: ANN001, ANN201
+    """Measure 20k balance transactions over a year of weekly windows, the list-based alternative to the itemized report."""
+    rows = 20_000
+    fake_stripe.objects.pop("/balance_transactions")
+    fake_stripe.add_objects("/balance_transactions", generate_objects("balance_transactions", rows, spacing=1500))
+    fake_stripe.latency = 0.02
+
+    sink = benchmark.pedantic(
+        lambda tap: sync_stream(tap, "balance_transactions"),
+        setup=lambda: ((make_tap(account_concurrency=concurrency),), {}),
+        rounds=1,
+    )
+
+    benchmark.extra_info["requests"] = fake_stripe.requests["/v1/balance_transactions"]
+    assert sink.records == rows
+
+
+def test_single_stream_startup(benchmark):  # noqa: ANN001, ANN201
+    """Measure creating a tap for a scheduled single-stream run, up to its first request."""
+    catalog = select_streams("charges")
+    config = {"api_key": "sk_test_fake", "start_date": "2024-01-01T00:00:00Z"}
+
+    params = benchmark(lambda: TapStripe(config=config, catalog=catalog).streams["charges"].get_url_params(None, None))
+
+    assert params["limit"] == 100
+
+
+@pytest.mark.parametrize("conformer", ["sdk", "compiled"])
+def test_charges_page_conform(benchmark, conformer):  # noqa: ANN001, ANN201
+    """Measure the per-record CPU of conforming a full page of charges, the SDK's generic walk against the compiled one."""
+    stream = TapStripe(config={"api_key": "sk_test_fake"}, catalog=select_streams("charges")).streams["charges"]
+    page = list(generate_objects("charges", 100))
+    if conformer == "sdk":
+        logger = logging.getLogger("tests.benchmarks")
+
+        def conform(record):  # noqa: ANN001, ANN202
+            pop_deselected_record_properties(record, stream.schema, stream.mask)
+            return conform_record_data_types(stream.name, record, stream.schema, TypeConformanceLevel.RECURSIVE, logger)
+    else:
+        compiled = compile_conformer(stream.schema, stream.mask)
+
+        def conform(record):  # noqa: ANN001, ANN202
+            return compiled(record)[0]
+
+    conformed = benchmark(lambda: [conform(dict(record)) for record in page])
+
+    benchmark.extra_info["records"] = len(page)
+    assert len(conformed) == len(page)
+
+
+@pytest.mark.parametrize("prefetch_pages", [0, 2])
+def test_charges_prefetch_throughput(benchmark, fake_stripe, make_tap, sync_stream, prefetch_pages):  # noqa: ANN001, ANN201
+    """Measure 3,000 charges behind 50 ms of latency per page, with pages fetched on demand or ahead of the writer."""
+    rows = 3_000
+    fake_stripe.objects.pop("/charges")
+    fake_stripe.add_objects("/charges", generate_objects("charges", rows))
+    fake_stripe.latency = 0.05
+
+    sink = benchmark.pedantic(
+        lambda tap: sync_stream(tap, "charges"),
+        setup=lambda: ((make_tap(prefetch_pages=prefetch_pages),), {}),
+        rounds=1,
+    )
+
+    assert sink.records == rows
@@ -0,0 +1,69 @@
+"""Tests for skipping records a re-sync finds unchanged."""
+
+from __future__ import annotations
+
+import contextlib
+import sqlite3
+
+import pytest
+
+from tests.conftest import RecordSink, select_streams
+
+
+def test_unchanged_records_are_not_emitted_again(fake_stripe, make_tap, sync_stream, tmp_path):  # noqa: ANN001, ANN201
+    """A lookback re-sync only emits the charges that changed since they were last emitted."""
+    index_path = str(tmp_path / "changes.sqlite")
+
+    first = sync_stream(make_tap(change_index_path=index_path), "charges")
+    unchanged = sync_stream(make_tap(change_index_path=index_path), "charges")
+    for charge in fake_stripe.objects["/charges"][:5]:
+        charge["amount_refunded"] = (charge["amount_refunded"] or 0) + 100
+    updated = sync_stream(make_tap(change_index_path=index_path), "charges")
+
+    assert first.records == 250
+    assert unchanged.records == 0
+    assert updated.records == 5
+
+
+def test_change_index_is_per_stream_and_optional(fake_stripe, make_tap, sync_stream, tmp_path):  # noqa: ANN001, ANN201, ARG001
+    """Streams keep separate hashes, and without an index every record is emitted each time."""
+    index_path = str(tmp_path / "changes.sqlite")
+    sync_stream(make_tap(change_index_path=index_path), "charges")
+
+    disputes = sync_stream(make_tap(change_index_path=index_path), "disputes")
+    again = sync_stream(make_tap(), "charges")
+
+    assert disputes.records == 120
+    assert again.records == 250
+
+
+def test_failed_file_sync_does_not_commit_hashes(make_tap, sync_stream, tmp_path, monkeypatch):  # noqa: ANN001, ANN201
+    """Hashes of records written to files of a failed sync are discarded, as no STATE covers them."""
+    index_path = str(tmp_path / "changes.sqlite")
+    tap = make_tap(
+        catalog=select_streams("charges", "refunds"), output_directory=str(tmp_path / "out"), change_index_path=index_path,
+    )
+
+    def fail(context):  # noqa: ANN001, ANN202, ARG001
+        raise RuntimeError
+
+    monkeypatch.setattr(tap.streams["refunds"], "get_records", fail)
+    with contextlib.redirect_stdout(RecordSink()), pytest.raises(RuntimeError):
+        tap.sync_all()
+
+    assert sync_stream(make_tap(change_index_path=index_path), "charges").records == 250
+
+
+def test_streams_with_per_run_fields_skip_the_index(make_tap, sync_stream, tmp_path):  # noqa: ANN001, ANN201
+    """Report rows and exchange rates carry the time of their run, so they are emitted without being hashed."""
+    index_path = tmp_path / "changes.sqlite"
+    tap = make_tap(change_index_path=str(index_path))
+    with contextlib.redirect_stdout(RecordSink()):
+        tap.sync_all()
+
+    connection = sqlite3.connect(index_path)
+    streams = {stream for (stream,) in connection.execute("SELECT DISTINCT stream FROM record_hashes")}
+    connection.close()
+
+    assert "charges" in streams
+    assert not streams & {"exchange_rates", "activity_summary_1", "activity_itemized_2"}
@@ -0,0 +1,45 @@
+"""Tests for the compiled record conformer."""
+
+from __future__ import annotations
+
+import copy
+import logging
+
+import pytest
+from singer_sdk.helpers._catalog import pop_deselected_record_properties
+from singer_sdk.helpers._typing import TypeConformanceLevel, conform_record_data_types
+
+from tap_stripe.conform import compile_conformer
+from tap_stripe.tap import TapStripe
+from tests.conftest import select_streams
+from tests.synthetic import generate_objects
+
+
+def sdk_conform(stream, record):  # noqa: ANN001, ANN201
+    """Conform a record the way the SDK does by default."""
+    record = copy.deepcopy(record)
+    pop_deselected_record_properties(record, stream.schema, stream.mask)
+    return conform_record_data_types(
+        stream.name, record, stream.schema, TypeConformanceLevel.RECURSIVE, logging.getLogger("tests.conform"),
+    )
+
+
+@pytest.mark.parametrize("stream_name", ["charges", "payment_intents", "disputes", "sources"])
+def test_compiled_conformer_matches_sdk(stream_name):  # noqa: ANN001, ANN201
+    """Records conform exactly like the SDK's generic walk, including deselected and unknown properties."""
+    catalog = select_streams(stream_name)
+    entry = next(entry for entry in catalog["streams"] if entry["tap_stream_id"] == stream_name)
+    for metadata in entry["metadata"]:
+        if metadata["breadcrumb"] in (["properties", "metadata"], ["properties", "amount"]):
+            metadata["metadata"]["selected"] = False
+    stream = TapStripe(config={"api_key": "sk_test_fake"}, catalog=catalog).streams[stream_name]
+    conform = compile_conformer(stream.schema, stream.mask)
+    records = list(generate_objects(stream_name, 200))
+    for record in records[:20]:
+        record["not_in_schema"] = {"nested": True}
+
+    for record in records:
+        assert conform(record)[0] == sdk_conform(stream, record)
+    conformed, unmapped = conform(records[0])
+    assert "amount" not in conformed
+    assert "not_in_schema" in unmapped
@@ -0,0 +1,26 @@
+"""Tests for dropping duplicate records."""
+
+from __future__ import annotations
+
+from tap_stripe.dedup import SeenKeys
+from tests.synthetic import generate_objects
+
+
+def test_seen_keys_tell_new_keys_from_repeated_ones():  # noqa: ANN201
+    """Every key is new exactly once, including keys only differing in the account."""
+    seen = SeenKeys()
+
+    assert all(seen.add([f"ch_{i}", "acct_1"]) for i in range(1000))
+    assert not any(seen.add([f"ch_{i}", "acct_1"]) for i in range(1000))
+    assert all(seen.add([f"ch_{i}", "acct_2"]) for i in range(1000))
+    assert len(seen) == 2000
+
+
+def test_duplicate_records_are_dropped(fake_stripe, make_tap, sync_stream):  # noqa: ANN001, ANN201
+    """Charges listed twice, e.g. by an overlapping window, are emitted once with `deduplicate`."""
+    fake_stripe.add_objects("/charges", generate_objects("charges", 40))
+    tap = make_tap(deduplicate=True)
+    sink = sync_stream(tap, "charges")
+
+    assert sink.records == 250
+    assert tap.streams["charges"].duplicates_dropped == 40
@@ -0,0 +1,124 @@
+"""Syncs paused by `max_runtime` and resumed by the next sync."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import threading
+
+from tap_stripe.tap import TapStripe
+from tests.conftest import START_DATE
+from tests.fake_stripe import FakeStripe
+from tests.synthetic import START_TIMESTAMP, generate_objects
+
+
+def exceed_after(tap, calls: int) -> None:  # noqa: ANN001
+    """Make the tap report its runtime as exceeded after it was checked `calls` times."""
+    checks = iter(range(calls + 1))
+    tap.runtime_exceeded = lambda: next(checks, None) is None
+
+
+def sync_messages(tap, stream_name: str) -> list[dict]:  # noqa: ANN001
+    """Sync one stream, returning its Singer messages."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        stream = tap.streams[stream_name]
+        stream.sync()
+        stream.finalize_state_progress_markers()
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def record_ids(messages: list[dict]) -> list[str]:
+    """Return the ids of the RECORD messages."""
+    return [message["record"]["id"] for message in messages if message["type"] == "RECORD"]
+
+
+def test_list_stream_resumes_after_last_record(make_tap):  # noqa: ANN001, ANN201
+    """A paused sync keeps the bookmark, and the next one writes exactly the remaining charges."""
+    first = make_tap(max_runtime=60)
+    exceed_after(first, 120)
+    paused = record_ids(sync_messages(first, "charges"))
+    bookmark = first.state["bookmarks"]["charges"]
+
+    assert 0 < len(paused) < 250  # noqa: PLR2004
+    assert bookmark.get("replication_key_value", START_DATE) == START_DATE
+    assert bookmark["resume"] == {"starting_after": paused[-1], "replication_key_value": START_TIMESTAMP + 250}
+
+    second = make_tap(state=first.state, max_runtime=60)
+    resumed = record_ids(sync_messages(second, "charges"))
+
+    assert len(paused) + len(resumed) == 250  # noqa: PLR2004
+    assert not set(paused) & set(resumed)
+    assert second.state["bookmarks"]["charges"] == {"replication_key": "created", "replication_key_value": START_TIMESTAMP + 250}
+
+
+def test_paused_windows_skip_the_rest(make_tap):  # noqa: ANN001, ANN201
+    """Windows after the paused one are left untouched for the next sync."""
+    first = make_tap(max_runtime=60)
+    exceed_after(first, 20)
+    paused = record_ids(sync_messages(first, "balance_transactions"))
+    partitions = first.state["bookmarks"]["balance_transactions"]["partitions"]
+
+    assert [partition for partition in partitions if "resume" in partition]
+    assert not [partition for partition in partitions if "replication_key_value" in partition]
+
+    second = make_tap(state=first.state)
+    resumed = record_ids(sync_messages(second, "balance_transactions"))
+
+    assert sorted(paused + resumed) == sorted(set(paused + resumed))
+    assert len(paused) + len(resumed) == 250  # noqa: PLR2004
+
+
+def test_report_resumes_in_flight_run_after_written_rows(fake_stripe, make_tap, monkeypatch):  # noqa: ANN001, ANN201
+    """A report paused mid-file records its rows in the in-flight run, and the next sync skips them."""
+    monkeypatch.setattr("tap_stripe.client.time.sleep", lambda _: None)
+    first = make_tap(max_runtime=60)
+    exceed_after(first, 200)
+    paused = [message for message in sync_messages(first, "activity_summary_1") if message["type"] == "RECORD"]
+    in_flight = first.state["bookmarks"]["activity_summary_1"]["in_flight_run"]
+
+    assert in_flight["rows"] == len(paused)
+
+    second = make_tap(state=first.state, max_runtime=60)
+    resumed = [message for message in sync_messages(second, "activity_summary_1") if message["type"] == "RECORD"]
+
+    assert len(paused) + len(resumed) == 500  # noqa: PLR2004
+    assert len(fake_stripe.report_runs) == 1
+    assert "in_flight_run" not in second.state["bookmarks"]["activity_summary_1"]
+
+
+def test_skipped_partitions_stop_prefetching_workers():  # noqa: ANN201
+    """Workers blocked on full partition buffers are stopped once the remaining partitions are skipped."""
+    fake = FakeStripe()
+    fake.add_objects("/balance_transactions", generate_objects("balance_transactions", 6000, spacing=200))
+    config = {"api_key": "sk_test_fake", "start_date": START_DATE, "max_requests_per_second": 1000, "max_runtime": 60}
+    tap = fake.install(TapStripe(config=config))
+
+    def first_window_completed() -> bool:
+        partitions = tap.state.get("bookmarks", {}).get("balance_transactions", {}).get("partitions", [])
+        return any("replication_key_value" in partition for partition in partitions)
+
+    tap.runtime_exceeded = first_window_completed
+    paused = record_ids(sync_messages(tap, "balance_transactions"))
+
+    assert 0 < len(paused) < 6000  # noqa: PLR2004
+
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("tap-stripe-partition")]
+
+
+def test_exchange_rates_resume_after_last_currency(make_tap):  # noqa: ANN001, ANN201
+    """Exchange rate rows have no id, so a paused sync lists on from the currency of the last row."""
+    first = make_tap(max_runtime=60)
+    exceed_after(first, 0)
+    paused = [message["record"] for message in sync_messages(first, "exchange_rates") if message["type"] == "RECORD"]
+
+    assert {row["send_currency"] for row in paused} == {"eur"}
+    assert first.state["bookmarks"]["exchange_rates"]["resume"]["starting_after"] == "eur"
+
+    second = make_tap(state=first.state, max_runtime=60)
+    resumed = [message["record"] for message in sync_messages(second, "exchange_rates") if message["type"] == "RECORD"]
+
+    assert {row["send_currency"] for row in resumed} == {"nok"}
+    assert len(paused) + len(resumed) == 4  # noqa: PLR2004
+    assert "resume" not in second.state["bookmarks"]["exchange_rates"]
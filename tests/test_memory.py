@@ -0,0 +1,130 @@
+"""Peak memory of syncing each stream, against a budget and against growth with the input size.
+
+Every stream is synced from a fresh `FakeStripe` at two input sizes, four times apart,
+with `tracemalloc` tracking the Python heap, after a tiny sync warms up lazy imports and
+caches. Cyclic garbage is collected every `COLLECT_EVERY` records, so the peak is memory
+the tap holds rather than garbage waiting for the collector. A stream fails when its
+peak at the larger size exceeds its budget, or when that peak is more than
+`GROWTH_BOUND` times the peak at the smaller size plus one report download block, which
+catches records being held for a whole sync long before they add up to an OOM kill.
+Set `TAP_STRIPE_MEMORY_SCALE` to multiply the input sizes.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import gc
+import os
+import tracemalloc
+
+import pytest
+
+from tap_stripe.client import SPOOL_BLOCK_BYTES
+from tap_stripe.tap import TapStripe
+from tests.conftest import (
+    REPORT_STREAMS,
+    START_DATE,
+    RecordSink,
+    add_checkout_sessions,
+    add_customers_with_sources,
+    select_streams,
+)
+from tests.fake_stripe import FakeStripe
+from tests.synthetic import START_TIMESTAMP, generate_objects, report_csv_file
+
+MEMORY_SCALE = int(os.environ.get("TAP_STRIPE_MEMORY_SCALE", "1"))
+WARM_UP_INPUT = 10
+SMALL_INPUT = 1000 * MEMORY_SCALE
+GROWTH_BOUND = 2.0
+COLLECT_EVERY = 250
+EXCHANGE_RATES_PER_CURRENCY = 10
+RECORDS_PER_PARENT = 4
+
+# Peak traced bytes allowed at four times SMALL_INPUT, whatever the scale.
+MEMORY_BUDGETS = {
+    "charges": 6 << 20,
+    "disputes": 4 << 20,
+    "payment_intents": 6 << 20,
+    "balance_transactions": 6 << 20,
+    "refunds": 2 << 20,
+    "report_runs": 4 << 20,
+    "exchange_rates": 2 << 20,
+    "checkout_session_line_items": 6 << 20,
+    # Pages of 100 customers embed all their sources, so a buffered page holds RECORDS_PER_PARENT times more records.
+    "sources": 20 << 20,
+    "activity_itemized_2": 6 << 20,
+    "activity_summary_1": 3 << 20,
+    "balance_change_from_activity_itemized_2": 6 << 20,
+    "balance_change_from_activity_summary_1": 3 << 20,
+}
+REPORT_TYPES = {stream_class.name: stream_class.original_name for stream_class in REPORT_STREAMS}
+
+
+class CollectingSink(RecordSink):
+    """Record counting stdout replacement that collects cyclic garbage every `COLLECT_EVERY` records."""
+
+    def write(self, text: str) -> int:  # noqa: D102
+        written = super().write(text)
+        if self.records % COLLECT_EVERY == 0 and text.startswith('{"type":"RECORD"'):
+            gc.collect()
+        return written
+
+
+def add_input(fake: FakeStripe, stream_name: str, size: int, tmp_path) -> int:  # noqa: ANN001
+    """Register `size` objects or report rows for a stream, returning the number of records it should emit."""
+    if stream_name in REPORT_TYPES:
+        content = report_csv_file(tmp_path / f"{stream_name}-{size}.csv", stream_name, size)
+        fake.add_objects("/reporting/report_runs", [])
+        fake.add_report(REPORT_TYPES[stream_name], START_TIMESTAMP, START_TIMESTAMP + 86400, content)
+        return size
+    if stream_name == "exchange_rates":
+        currencies = max(1, size // EXCHANGE_RATES_PER_CURRENCY)
+        rates = {f"c{index:03d}": 1.0 + index / 1000 for index in range(EXCHANGE_RATES_PER_CURRENCY)}
+        fake.add_objects(
+            "/exchange_rates",
+            [{"id": f"s{index:04d}", "object": "exchange_rate", "rates": rates} for index in range(currencies)],
+        )
+        return currencies * EXCHANGE_RATES_PER_CURRENCY
+    if stream_name == "checkout_session_line_items":
+        add_checkout_sessions(fake, [RECORDS_PER_PARENT] * max(1, size // RECORDS_PER_PARENT))
+        return max(1, size // RECORDS_PER_PARENT) * RECORDS_PER_PARENT
+    if stream_name == "sources":
+        add_customers_with_sources(fake, [RECORDS_PER_PARENT] * max(1, size // RECORDS_PER_PARENT))
+        return max(1, size // RECORDS_PER_PARENT) * RECORDS_PER_PARENT
+    if stream_name == "report_runs":
+        fake.report_runs.extend({**run, "_account": None} for run in generate_objects(stream_name, size, spacing=3600))
+        return size
+    fake.add_objects(f"/{stream_name}", generate_objects(stream_name, size, spacing=3600))
+    return size
+
+
+def peak_memory(stream_name: str, size: int, tmp_path) -> int:  # noqa: ANN001
+    """Sync one stream from a fresh fake API, returning the peak traced bytes of the sync itself."""
+    fake = FakeStripe()
+    expected = add_input(fake, stream_name, size, tmp_path)
+    config = {"api_key": "sk_test_fake", "start_date": START_DATE, "max_requests_per_second": 1000}
+    tap = fake.install(TapStripe(config=config, catalog=select_streams(stream_name)))
+    sink = CollectingSink()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(sink):
+            stream = tap.streams[stream_name]
+            stream.sync()
+            stream.finalize_state_progress_markers()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert sink.records == expected
+    return peak
+
+
+@pytest.mark.parametrize("stream_name", list(MEMORY_BUDGETS))
+def test_stream_peak_memory(stream_name, tmp_path):  # noqa: ANN001, ANN201
+    """Peak memory stays within the stream's budget and does not grow with the number of records."""
+    peak_memory(stream_name, WARM_UP_INPUT, tmp_path)
+    small = peak_memory(stream_name, SMALL_INPUT, tmp_path)
+    large = peak_memory(stream_name, 4 * SMALL_INPUT, tmp_path)
+
+    assert large <= MEMORY_BUDGETS[stream_name], f"peak {large} bytes, budget {MEMORY_BUDGETS[stream_name]}"
+    assert large <= GROWTH_BOUND * small + SPOOL_BLOCK_BYTES, f"peak grew from {small} to {large} bytes for four times the input"
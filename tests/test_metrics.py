@@ -0,0 +1,82 @@
+"""Tests for the per-stream performance metrics."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import logging.handlers
+
+from tap_stripe.metrics import StreamMetrics, normalize_endpoint
+from tests.conftest import RecordSink, select_streams
+
+
+def test_normalize_endpoint_hides_object_ids():  # noqa: ANN201
+    """Object ids are collapsed while resource names and report types are kept."""
+    assert normalize_endpoint("/v1/reporting/report_runs/frr_1NabcDEF23") == "/v1/reporting/report_runs/{id}"
+    assert normalize_endpoint("/v1/reporting/report_types/activity.itemized.2") == "/v1/reporting/report_types/activity.itemized.2"
+    assert normalize_endpoint("/v1/payment_intents") == "/v1/payment_intents"
+
+
+def test_partition_metrics_roll_up_to_stream():  # noqa: ANN201
+    """Per-partition measurements are reported separately and summed for the stream."""
+    collected = StreamMetrics("charges")
+    collected.observe_request("/v1/charges", 0.2, 100, {"account_id": "acct_1"})
+    collected.observe_request("/v1/charges", 3.0, 50, {"account_id": "acct_2"})
+
+    points = list(collected.points())
+    total = collected.total()
+
+    assert total.bytes_downloaded == 150
+    assert total.latency["/v1/charges"].count == 2
+    assert len([point for point in points if point.metric == "bytes_downloaded"]) == 3
+
+
+def test_sync_logs_metrics_and_writes_textfile(make_tap, sync_stream, tmp_path):  # noqa: ANN001, ANN201
+    """A stream sync emits METRIC log lines and a Prometheus textfile with its totals."""
+    textfile = tmp_path / "tap_stripe.prom"
+    tap = make_tap(metrics_textfile=str(textfile))
+    stream = tap.streams["charges"]
+    sync_stream(tap, "charges")
+    stream.metrics_logger = logging.getLogger("tests.metrics")
+    stream.metrics_logger.setLevel(logging.INFO)
+    handler = logging.handlers.BufferingHandler(capacity=1000)
+    stream.metrics_logger.addHandler(handler)
+    stream.log_sync_costs()
+
+    points = [json.loads(record.getMessage().split("METRIC: ", 1)[1]) for record in handler.buffer]
+    pages = next(point for point in points if point["metric"] == "pages_fetched")
+    content = textfile.read_text()
+
+    assert pages["value"] == 3
+    assert pages["tags"]["stream"] == "charges"
+    assert 'tap_stripe_records_total{stream="charges"} 250' in content
+    assert 'tap_stripe_http_request_duration_seconds_count{stream="charges",endpoint="/v1/charges"} 3' in content
+    assert "# TYPE tap_stripe_http_request_duration_seconds histogram" in content
+
+
+def test_records_are_counted_per_window(make_tap, sync_stream):  # noqa: ANN001, ANN201
+    """Records written from concurrently fetched windows are counted against their own window."""
+    tap = make_tap()
+    sync_stream(tap, "balance_transactions")
+    collected = tap.streams["balance_transactions"].performance_metrics
+    partitions = tap.state["bookmarks"]["balance_transactions"]["partitions"]
+    records = [collected.partition(partition["context"]).records for partition in partitions]
+
+    assert sum(records) == collected.total().records == 250
+    assert len([count for count in records if count]) == 2
+
+
+def test_textfile_is_written_when_each_stream_ends(make_tap, tmp_path, monkeypatch):  # noqa: ANN001, ANN201
+    """The textfile is updated once per synced stream, as soon as that stream's sync ends."""
+    written = []
+
+    def write(path, stream_metrics):  # noqa: ANN001, ANN202, ARG001
+        written.append([collected.stream_name for collected in stream_metrics if collected.total().records])
+
+    monkeypatch.setattr("tap_stripe.client.write_prometheus_textfile", write)
+    tap = make_tap(catalog=select_streams("charges", "refunds"), metrics_textfile=str(tmp_path / "tap_stripe.prom"))
+    with contextlib.redirect_stdout(RecordSink()):
+        tap.sync_all()
+
+    assert written == [["charges"], ["charges", "refunds"]]
@@ -0,0 +1,91 @@
+"""Sync plans estimated against `FakeStripe`."""
+
+from __future__ import annotations
+
+import json
+
+from click.testing import CliRunner
+
+from tap_stripe.planning import StreamPlan, format_plan
+from tap_stripe.tap import TapStripe
+from tests.conftest import select_streams
+
+
+def test_list_stream_plan_extrapolates_first_page(fake_stripe, make_tap):  # noqa: ANN001, ANN201
+    """The charges plan is extrapolated from one page to the three a sync takes."""
+    plan = make_tap().streams["charges"].plan()
+
+    assert fake_stripe.requests["/v1/charges"] == 1
+    assert plan.layout == "1 partition"
+    assert abs(plan.records - 250) <= 5  # noqa: PLR2004
+    assert plan.requests == 3  # noqa: PLR2004
+    assert plan.bytes > 0
+
+
+def test_windowed_stream_plan_describes_layout(make_tap):  # noqa: ANN001, ANN201
+    """Balance transactions are planned as weekly windows, probing only a sample of them."""
+    plan = make_tap().streams["balance_transactions"].plan()
+
+    assert plan.layout.endswith("windows of 7 days")
+    assert plan.partitions > 3  # noqa: PLR2004
+    assert plan.requests >= plan.partitions
+
+
+def test_exchange_rates_plan_counts_rows(fake_stripe, make_tap):  # noqa: ANN001, ANN201
+    """Every rate of an exchange rate object is a row, so the plan counts rates, not objects."""
+    rates = {f"c{index:03d}": 1.0 + index / 1000 for index in range(150)}
+    fake_stripe.objects["/exchange_rates"] = [
+        {"id": currency, "object": "exchange_rate", "rates": rates} for currency in ("eur", "nok")
+    ]
+
+    plan = make_tap().streams["exchange_rates"].plan()
+
+    assert plan.records == 300  # noqa: PLR2004
+    assert plan.requests == 1
+
+
+def test_report_plan_uses_previous_run_size(fake_stripe, make_tap, sync_stream, monkeypatch):  # noqa: ANN001, ANN201
+    """Without earlier runs the report size is unknown; after one, it is estimated from that run."""
+    monkeypatch.setattr("tap_stripe.client.time.sleep", lambda _: None)
+    assert make_tap().streams["activity_summary_1"].plan().bytes is None
+    sync_stream(make_tap(), "activity_summary_1")
+
+    plan = make_tap().streams["activity_summary_1"].plan()
+
+    assert plan.report_runs == 1
+    assert plan.bytes == fake_stripe.report_runs[0]["result"]["size"]
+    assert len(fake_stripe.report_runs) == 1
+
+
+def test_plan_option_prints_table_without_records(fake_stripe, tmp_path, monkeypatch):  # noqa: ANN001, ANN201
+    """`--plan` prints one row per selected stream and a total, and emits no messages."""
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"api_key": "sk_test_fake", "start_date": "2024-01-01T00:00:00Z"}))
+    catalog = tmp_path / "catalog.json"
+    catalog.write_text(json.dumps(select_streams("charges", "refunds")))
+    original_init = TapStripe.__init__
+
+    def init(self, *args, **kwargs) -> None:  # noqa: ANN001, ANN002, ANN003
+        original_init(self, *args, **kwargs)
+        fake_stripe.install(self)
+
+    monkeypatch.setattr(TapStripe, "__init__", init)
+    result = CliRunner().invoke(TapStripe.cli, ["--config", str(config), "--catalog", str(catalog), "--plan"])
+
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    header = next(index for index, line in enumerate(lines) if line.startswith("stream "))
+    assert [line.split()[0] for line in lines[header + 2 : header + 5]] == ["charges", "refunds", "total"]
+    assert not any(line.startswith('{"type"') for line in lines)
+
+
+def test_format_plan_totals_known_bytes():  # noqa: ANN201
+    """Totals add up every stream, with unknown report sizes left out of the bytes."""
+    plans = [
+        StreamPlan("charges", "1 partition", partitions=1, requests=30, records=3000, bytes=2048),
+        StreamPlan("activity_summary_1", "1 partition", partitions=1, requests=5, report_runs=1),
+    ]
+
+    total = format_plan(plans, requests_per_second=25).splitlines()[4].split()
+
+    assert total == ["total", "2", "3000", "35", "1", "2.0", "KiB", "0m01s"]
@@ -0,0 +1,66 @@
+"""Tests for the profiling hooks."""
+
+from __future__ import annotations
+
+import pstats
+
+from click.testing import CliRunner
+
+from tap_stripe.profiling import profile_run
+from tap_stripe.tap import TapStripe
+
+
+def _busy_loop() -> int:
+    return sum(i * i for i in range(200_000))
+
+
+def test_cprofile_writes_pstats(tmp_path):  # noqa: ANN001, ANN201
+    """The cprofile mode writes a file pstats can load."""
+    path = tmp_path / "run.pstats"
+    with profile_run(str(path)):
+        _busy_loop()
+
+    functions = {name for _, _, name in pstats.Stats(str(path)).stats}
+    assert "_busy_loop" in functions
+
+
+def test_sampling_writes_collapsed_stacks(tmp_path):  # noqa: ANN001, ANN201
+    """The sampling mode writes `frame;frame count` lines."""
+    path = tmp_path / "run.folded"
+    with profile_run(str(path), mode="sampling", interval=0.001):
+        for _ in range(20):
+            _busy_loop()
+
+    lines = path.read_text().splitlines()
+    assert any("test_profiling.py:_busy_loop" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_cprofile_covers_prefetching_threads(make_tap, sync_stream, tmp_path):  # noqa: ANN001, ANN201
+    """Pages parsed by the prefetching worker thread show up in the profile."""
+    path = tmp_path / "sync.pstats"
+    with profile_run(str(path)):
+        sync_stream(make_tap(prefetch_pages=2), "charges")
+
+    functions = {name for _, _, name in pstats.Stats(str(path)).stats}
+    assert {"parse_response", "post_process", "_request"} <= functions
+
+
+def test_section_timers_count_hot_sections(make_tap, sync_stream):  # noqa: ANN001, ANN201
+    """With profile_sections enabled, report download and row post-processing are counted."""
+    tap = make_tap(profile_sections=True)
+    sync_stream(tap, "activity_summary_1")
+    timers = tap.streams["activity_summary_1"].section_timers
+
+    assert timers.calls["download_report"] == 1
+    assert timers.calls["post_process"] == 500
+    assert timers.seconds["download_report"] >= timers.seconds["post_process"]
+
+
+def test_cli_profile_option(tmp_path):  # noqa: ANN001, ANN201
+    """`--profile` is accepted by the CLI and writes a profile even when the run exits early."""
+    path = tmp_path / "about.pstats"
+    result = CliRunner().invoke(TapStripe.cli, ["--about", "--profile", str(path)])
+
+    assert result.exit_code == 0
+    assert path.exists()
@@ -0,0 +1,51 @@
+"""Report file parsing, in the tap process and in worker processes."""
+
+from __future__ import annotations
+
+import csv
+
+from tap_stripe.reports import RowConverter, parse_chunk, parse_parallel, split_csv
+from tests.synthetic import START_TIMESTAMP, write_report_csv
+
+CONVERTER = RowConverter(
+    id_keys=("balance_transaction_id", "fee_id"),
+    primary_key="activity_itemized_2_id",
+    report_start_at=START_TIMESTAMP,
+    report_end_at=START_TIMESTAMP + 86400,
+)
+
+
+def without_loaded_at(rows):  # noqa: ANN001, ANN201
+    """Drop the parse-time column, which differs between runs."""
+    return [{key: value for key, value in row.items() if key != "loaded_at"} for row in rows]
+
+
+def test_chunks_never_split_quoted_newlines(tmp_path):  # noqa: ANN001, ANN201
+    """Chunks end outside quoted values, so chunked parsing matches parsing the whole file."""
+    path = tmp_path / "report.csv"
+    with path.open("w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["balance_transaction_id", "fee_id", "description"])
+        for index in range(200):
+            writer.writerow([f"txn_{index}", f"fee_{index}", f'line one\nline "two" of {index}'])
+
+    fieldnames, ranges = split_csv(str(path), chunk_bytes=256)
+    chunked = [row for start, end in ranges for row in parse_chunk(str(path), start, end, fieldnames, CONVERTER)]
+
+    with path.open(newline="") as handle:
+        expected = [CONVERTER(row) for row in csv.DictReader(handle)]
+    assert len(ranges) > 10
+    assert without_loaded_at(chunked) == without_loaded_at(expected)
+
+
+def test_parallel_parsing_keeps_file_order(tmp_path):  # noqa: ANN001, ANN201
+    """Rows parsed by worker processes come back in file order."""
+    path = tmp_path / "itemized.csv"
+    with path.open("w", newline="") as handle:
+        write_report_csv(handle, "activity_itemized_2", 2000)
+
+    rows = list(parse_parallel(str(path), CONVERTER, processes=2, chunk_bytes=64 * 1024))
+
+    with path.open(newline="") as handle:
+        expected = [CONVERTER(row) for row in csv.DictReader(handle)]
+    assert without_loaded_at(rows) == without_loaded_at(expected)
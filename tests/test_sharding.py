@@ -0,0 +1,134 @@
+"""Sharded syncs against `FakeStripe`, and merging their states."""
+
+from __future__ import annotations
+
+import json
+
+from click.testing import CliRunner
+
+from tap_stripe.sharding import merge_state, merge_states
+from tests.synthetic import generate_objects
+
+SHARDS = 3
+
+
+def sync_shards(make_tap, sync_stream, stream_name, **config):  # noqa: ANN001, ANN003, ANN201
+    """Sync one stream in every shard, returning the record count and final state of each."""
+    results = []
+    for index in range(SHARDS):
+        tap = make_tap(shard_index=index, shard_count=SHARDS, **config)
+        results.append((sync_stream(tap, stream_name).records, tap.state))
+    return results
+
+
+def test_shards_split_created_windows_without_overlap(fake_stripe, make_tap, sync_stream):  # noqa: ANN001, ANN201
+    """Every charge is emitted by exactly one shard, and the merged state has every window once."""
+    fake_stripe.objects.clear()
+    fake_stripe.add_objects("/charges", generate_objects("charges", 250, spacing=3 * 86400))
+
+    results = sync_shards(make_tap, sync_stream, "charges", window_days=30)
+
+    assert sum(records for records, _ in results) == 250
+    assert all(records for records, _ in results)
+    merged = merge_states(state for _, state in results)
+    windows = [partition["context"] for partition in merged["bookmarks"]["charges"]["partitions"]]
+    assert sorted(windows, key=lambda window: window["created_gte"]) == make_tap(window_days=30).streams["charges"].created_windows()
+
+
+def test_shards_split_accounts(fake_stripe, make_tap, sync_stream):  # noqa: ANN001, ANN201
+    """With accounts, whole accounts are assigned to shards."""
+    accounts = [{"id": f"acct_1Sharded{index:07d}"} for index in range(6)]
+    for account in accounts:
+        fake_stripe.add_objects("/disputes", generate_objects("disputes", 10), account=account["id"])
+
+    results = sync_shards(make_tap, sync_stream, "disputes", accounts=accounts)
+
+    assert sum(records for records, _ in results) == 60
+    merged = merge_states(state for _, state in results)
+    assert sorted(p["context"]["account_id"] for p in merged["bookmarks"]["disputes"]["partitions"]) == [
+        account["id"] for account in accounts
+    ]
+
+
+def test_unpartitioned_stream_is_synced_by_one_shard(make_tap, sync_stream):  # noqa: ANN001, ANN201
+    """Streams that cannot be windowed are assigned to a single shard as a whole."""
+    results = sync_shards(make_tap, sync_stream, "exchange_rates")
+
+    assert sorted(records for records, _ in results) == [0, 0, 4]
+
+
+def test_merge_state_keeps_the_furthest_bookmarks(tmp_path):  # noqa: ANN001, ANN201
+    """Partitions are combined by context and the furthest bookmark wins; the CLI prints the merge."""
+    first = {
+        "bookmarks": {
+            "charges": {"partitions": [{"context": {"account_id": "a"}, "replication_key": "created", "replication_key_value": 5}]},
+            "exchange_rates": {"starting_replication_value": None},
+        },
+    }
+    second = {
+        "bookmarks": {
+            "charges": {
+                "partitions": [
+                    {"context": {"account_id": "a"}, "replication_key": "created", "replication_key_value": 9},
+                    {"context": {"account_id": "b"}, "replication_key": "created", "replication_key_value": 3},
+                ],
+            },
+            "exchange_rates": {"replication_key": "created", "replication_key_value": 7},
+        },
+    }
+    paths = []
+    for index, state in enumerate((first, second)):
+        paths.append(tmp_path / f"state-{index}.json")
+        paths[-1].write_text(json.dumps(state))
+
+    result = CliRunner().invoke(merge_state, [str(path) for path in paths])
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output) == {
+        "bookmarks": {
+            "charges": {
+                "partitions": [
+                    {"context": {"account_id": "a"}, "replication_key": "created", "replication_key_value": 9},
+                    {"context": {"account_id": "b"}, "replication_key": "created", "replication_key_value": 3},
+                ],
+            },
+            "exchange_rates": {"replication_key": "created", "replication_key_value": 7},
+        },
+    }
+
+
+def test_merge_state_does_not_depend_on_the_order_of_the_states():  # noqa: ANN201
+    """Of equal bookmarks, the one a shard paused, closed or left a report run in flight in wins in any order."""
+    window = {"created_gte": 1704067200, "created_lt": 1704672000}
+    unchanged = {
+        "bookmarks": {
+            "charges": {"partitions": [{"context": window, "replication_key": "created", "replication_key_value": 5}]},
+            "balance_transactions": {"partitions": [{"context": window}]},
+            "activity_summary_1": {"replication_key": "report_end_at", "replication_key_value": 7},
+        },
+    }
+    synced = {
+        "bookmarks": {
+            "charges": {
+                "partitions": [
+                    {
+                        "context": window,
+                        "replication_key": "created",
+                        "replication_key_value": 5,
+                        "resume": {"starting_after": "ch_1", "replication_key_value": 9},
+                    },
+                ],
+            },
+            "balance_transactions": {"partitions": [{"context": window, "closed": True}]},
+            "activity_summary_1": {
+                "replication_key": "report_end_at",
+                "replication_key_value": 7,
+                "in_flight_run": {"id": "frr_1", "interval_start": 7, "interval_end": 11},
+            },
+        },
+    }
+
+    merged = merge_states([unchanged, synced])
+
+    assert merged == merge_states([synced, unchanged])
+    assert merged == synced
@@ -0,0 +1,57 @@
+"""Writing records to compressed files with `FileSink`."""
+
+from __future__ import annotations
+
+import contextlib
+import gzip
+import json
+import os
+
+from tap_stripe.sink import FileSink
+from tests.conftest import RecordSink, select_streams
+
+
+def read_manifest(directory) -> dict:  # noqa: ANN001
+    """Return the only manifest in `directory`."""
+    (name,) = [name for name in os.listdir(directory) if name.startswith("manifest-")]
+    with open(directory / name) as file:
+        return json.load(file)
+
+
+def test_files_rotate_by_compressed_size(tmp_path, monkeypatch):  # noqa: ANN001, ANN201
+    """Files are completed once they reach the size limit, and together hold every record in order."""
+    monkeypatch.setattr("tap_stripe.sink.FLUSH_BYTES", 1024)
+    sink = FileSink(str(tmp_path), max_file_bytes=16384)
+    sink.write_schema("charges", {"type": "object"}, ["id"])
+    for i in range(20000):
+        sink.write_record("charges", {"id": f"ch_{i}", "amount": i * 7919 % 100000})
+    sink.close()
+
+    files = read_manifest(tmp_path)["streams"]["charges"]["files"]
+    assert len(files) > 1
+    assert sum(file["records"] for file in files) == 20000  # noqa: PLR2004
+    ids = []
+    for file in files:
+        assert os.path.getsize(tmp_path / file["path"]) == file["bytes"]
+        with gzip.open(tmp_path / file["path"], "rt") as lines:
+            ids.extend(json.loads(line)["id"] for line in lines)
+    assert ids == [f"ch_{i}" for i in range(20000)]
+    assert not [path for path in tmp_path.rglob("*.part")]
+
+
+def test_sync_writes_files_and_only_final_state(make_tap, tmp_path):  # noqa: ANN001, ANN201
+    """With `output_directory`, stdout gets no records or schemas, and one STATE after the manifest."""
+    tap = make_tap(catalog=select_streams("charges", "refunds"), output_directory=str(tmp_path))
+    sink = RecordSink()
+    with contextlib.redirect_stdout(sink):
+        tap.sync_all()
+
+    assert sink.records == 0
+    assert [json.loads(message)["type"] for message in sink.messages] == ["STATE"]
+    assert json.loads(sink.messages[0])["value"] == tap.state
+    streams = read_manifest(tmp_path)["streams"]
+    assert {name: sum(file["records"] for file in stream["files"]) for name, stream in streams.items()} == {
+        "charges": 250,
+        "refunds": 250,
+    }
+    assert streams["charges"]["key_properties"] == ["id"]
@@ -0,0 +1,268 @@
+"""Offline stream tests against `FakeStripe`."""
+
+from __future__ import annotations
+
+import time
+
+import requests
+
+from tap_stripe.reports import RowConverter
+from tests.conftest import REPORT_STREAMS, select_streams
+from tests.synthetic import START_TIMESTAMP, generate_objects, report_csv
+
+
+def test_list_stream_pages_until_exhausted(fake_stripe, make_tap, sync_stream):  # noqa: ANN001, ANN201
+    """All charges are emitted with one request per page, stopping when `has_more` is false."""
+    sink = sync_stream(make_tap(), "charges")
+
+    assert sink.records == 250
+    assert fake_stripe.requests["/v1/charges"] == 3
+
+
+def test_list_stream_resumes_from_state(fake_stripe, make_tap, sync_stream):  # noqa: ANN001, ANN201
+    """Only charges created after the bookmarked value are requested."""
+    state = {"bookmarks": {"charges": {"replication_key": "created", "replication_key_value": START_TIMESTAMP + 200}}}
+    sink = sync_stream(make_tap(state=state), "charges")
+
+    assert sink.records == 50
+    assert fake_stripe.requests["/v1/charges"] == 1
+
+
+def test_report_stream_waits_for_pending_run(fake_stripe, make_tap, sync_stream, monkeypatch):  # noqa: ANN001, ANN201
+    """A report run that is still pending is polled until it succeeds, then downloaded."""
+    monkeypatch.setattr("tap_stripe.client.time.sleep", lambda _: None)
+    fake_stripe.report_pending_polls = 2
+    sink = sync_stream(make_tap(), "activity_summary_1")
+
+    assert sink.records == 500
+    assert fake_stripe.requests["/v1/reporting/report_runs"] == 2
+    assert fake_stripe.requests[f"/v1/reporting/report_runs/{fake_stripe.report_runs[0]['id']}"] == 3
+
+
+def test_report_streams_share_one_report_types_request(fake_stripe, make_tap, sync_stream):  # noqa: ANN001, ANN201
+    """Data availability of all report streams comes from a single cached `/report_types` request."""
+    tap = make_tap()
+    for stream_class in REPORT_STREAMS:
+        assert sync_stream(tap, stream_class.name).records == 500
+
+    assert fake_stripe.requests["/v1/reporting/report_types"] == 1
+    assert not any(path.startswith("/v1/reporting/report_types/") for path in fake_stripe.requests)
+
+
+def test_catalog_instantiates_only_selected_streams(make_tap, sync_stream):  # noqa: ANN001, ANN201
+    """With a catalog, unselected streams are never built."""
+    tap = make_tap(catalog=select_streams("charges"))
+
+    assert list(tap.streams) == ["charges"]
+    assert sync_stream(tap, "charges").records == 250
+
+
+def test_report_run_is_resumed_from_state(fake_stripe, make_tap, sync_stream, monkeypatch):  # noqa: ANN001, ANN201
+    """A run still pending when a sync gives up is recorded in state and polled again by the next sync."""
+    monkeypatch.setattr("tap_stripe.client.time.sleep", lambda _: None)
+    fake_stripe.report_pending_polls = 8
+    first = make_tap()
+    assert sync_stream(first, "activity_summary_1").records == 0
+    in_flight = first.state["bookmarks"]["activity_summary_1"]["in_flight_run"]
+    assert in_flight["id"] == fake_stripe.report_runs[0]["id"]
+
+    second = make_tap(state=first.state)
+    assert sync_stream(second, "activity_summary_1").records == 500
+    assert len(fake_stripe.report_runs) == 1
+    assert "in_flight_run" not in second.state["bookmarks"]["activity_summary_1"]
+
+
+def test_report_run_is_issued_idempotently(fake_stripe, make_tap, sync_stream, monkeypatch):  # noqa: ANN001, ANN201
+    """Issuing the same run twice without state, e.g. after a crash, reuses the first run."""
+    monkeypatch.setattr("tap_stripe.client.time.sleep", lambda _: None)
+    fake_stripe.report_pending_polls = 8
+    sync_stream(make_tap(), "activity_summary_1")
+    sync_stream(make_tap(), "activity_summary_1")
+
+    assert len(fake_stripe.report_runs) == 1
+
+
+def test_report_run_requests_only_selected_columns(fake_stripe, make_tap, sync_stream):  # noqa: ANN001, ANN201
+    """Deselected report properties are left out of the run's columns; `id_keys` are always requested."""
+    catalog = select_streams("activity_itemized_2")
+    entry = next(entry for entry in catalog["streams"] if entry["tap_stream_id"] == "activity_itemized_2")
+    for metadata in entry["metadata"]:
+        name = metadata["breadcrumb"][-1] if metadata["breadcrumb"] else ""
+        if name.startswith(("customer_", "shipping_", "card_", "fee_id")):
+            metadata["metadata"]["selected"] = False
+
+    tap = make_tap(catalog=catalog)
+    sink = sync_stream(tap, "activity_itemized_2")
+
+    columns = fake_stripe.report_runs[0]["parameters"]["columns"]
+    assert sink.records == 500
+    assert "fee_id" in columns
+    assert not any(column.startswith(("customer_", "shipping_", "card_")) for column in columns)
+    assert "loaded_at" not in columns
+    file_bytes = fake_stripe.bytes_sent[f"/v1/files/file_{fake_stripe.report_runs[0]['id']}/contents"]
+    assert file_bytes < 0.75 * len(report_csv("activity_itemized_2", 500))
+
+
+def test_balance_transactions_are_synced_in_weekly_windows(make_tap, sync_stream):  # noqa: ANN001, ANN201
+    """Balance transactions are partitioned into weekly `created` windows, each bookmarked separately."""
+    tap = make_tap()
+    sink = sync_stream(tap, "balance_transactions")
+
+    partitions = tap.state["bookmarks"]["balance_transactions"]["partitions"]
+    assert sink.records == 250
+    assert all(p["context"]["created_lt"] - p["context"]["created_gte"] == 7 * 86400 for p in partitions)
+    assert sum("replication_key_value" in partition for partition in partitions) == 2
+
+
+def test_line_items_are_expanded_into_session_pages(make_tap, sync_stream, fake_stripe):  # noqa: ANN001, ANN201
+    """Line items come embedded in session pages; only sessions with more than one page are fetched separately."""
+    tap = make_tap()
+    sink = sync_stream(tap, "checkout_session_line_items")
+
+    separate = {path for path in fake_stripe.requests if path.endswith("/line_items")}
+    assert sink.records == 28 * 3 + 2 * 25
+    assert fake_stripe.requests["/v1/checkout/sessions"] == 1
+    assert len(separate) == 2
+    assert fake_stripe.total_requests == 3
+    bookmark = tap.state["bookmarks"]["checkout_session_line_items"]
+    assert bookmark["replication_key_value"] == START_TIMESTAMP + 30
+
+
+def test_refunds_are_listed_from_the_top_level_endpoint(make_tap, sync_stream, fake_stripe):  # noqa: ANN001, ANN201
+    """Refunds are listed once for the account rather than per charge."""
+    sink = sync_stream(make_tap(), "refunds")
+
+    assert sink.records == 250
+    assert set(fake_stripe.requests) == {"/v1/refunds"}
+
+
+def test_sources_are_searched_incrementally_through_customers(make_tap, sync_stream, fake_stripe):  # noqa: ANN001, ANN201
+    """Customers are searched by `created` after the bookmark, with their sources expanded."""
+    bookmark = {"replication_key": "customer_created", "replication_key_value": START_TIMESTAMP + 40}
+    state = {"bookmarks": {"sources": bookmark}}
+    sink = sync_stream(make_tap(state=state), "sources")
+
+    assert sink.records == 100 + 10 * 12
+    assert fake_stripe.requests["/v1/customers/search"] == 2
+    assert fake_stripe.requests["/v1/customers"] == 0
+    assert sum(count for path, count in fake_stripe.requests.items() if path.endswith("/sources")) == 10
+
+
+def test_pages_are_prefetched_while_records_are_written(fake_stripe, make_tap):  # noqa: ANN001, ANN201
+    """Following pages are requested in the background while the consumer is still on the first record."""
+    records = make_tap().streams["charges"].get_records(None)
+    next(records)
+    deadline = time.monotonic() + 5
+    while fake_stripe.requests["/v1/charges"] < 3 and time.monotonic() < deadline:  # noqa: PLR2004
+        time.sleep(0.01)
+    records.close()
+
+    assert fake_stripe.requests["/v1/charges"] == 3
+
+
+def test_pages_are_fetched_on_demand_without_prefetch(fake_stripe, make_tap):  # noqa: ANN001, ANN201
+    """With `prefetch_pages` 0, the next page is only requested once the current one is consumed."""
+    records = make_tap(prefetch_pages=0).streams["charges"].get_records(None)
+    next(records)
+    time.sleep(0.1)
+    records.close()
+
+    assert fake_stripe.requests["/v1/charges"] == 1
+
+
+def test_slow_page_is_hedged(fake_stripe, make_tap, sync_stream):  # noqa: ANN001, ANN201
+    """A page far slower than the recent ones is requested again, and the faster copy is used."""
+    fake_stripe.objects.pop("/charges")
+    fake_stripe.add_objects("/charges", generate_objects("charges", 3000))
+    fake_stripe.latency = 0.01
+    fake_stripe.delays["/v1/charges"] = [0.0] * 25 + [3.0]
+    tap = make_tap(hedge_percentile=90)
+
+    started = time.perf_counter()
+    sink = sync_stream(tap, "charges")
+    elapsed = time.perf_counter() - started
+
+    hedged = tap.streams["charges"].performance_metrics.total().hedged_requests
+    assert sink.records == 3000
+    assert elapsed < 2.5
+    assert hedged >= 1
+    # The stalled copy is only counted once it is answered, after the sync.
+    assert 30 <= fake_stripe.requests["/v1/charges"] < 30 + hedged
+
+
+def test_failed_report_run_is_issued_again(fake_stripe, make_tap, sync_stream, monkeypatch):  # noqa: ANN001, ANN201
+    """An in-flight run that failed is replaced by a new run, instead of being polled by every later sync."""
+    monkeypatch.setattr("tap_stripe.client.time.sleep", lambda _: None)
+    fake_stripe.report_pending_polls = 8
+    first = make_tap()
+    sync_stream(first, "activity_summary_1")
+    fake_stripe.report_runs[0]["status"] = "failed"
+    fake_stripe.report_pending_polls = 0
+
+    second = make_tap(state=first.state)
+    assert sync_stream(second, "activity_summary_1").records == 500
+    assert len(fake_stripe.report_runs) == 2
+    assert "in_flight_run" not in second.state["bookmarks"]["activity_summary_1"]
+
+
+def test_unknown_report_run_is_issued_again(fake_stripe, make_tap, sync_stream, monkeypatch):  # noqa: ANN001, ANN201
+    """An in-flight run Stripe does not know is replaced by a new run."""
+    monkeypatch.setattr("tap_stripe.client.time.sleep", lambda _: None)
+    fake_stripe.report_pending_polls = 8
+    first = make_tap()
+    sync_stream(first, "activity_summary_1")
+    first.state["bookmarks"]["activity_summary_1"]["in_flight_run"]["id"] = "frr_unknown"
+    fake_stripe.report_pending_polls = 0
+
+    second = make_tap(state=first.state)
+    assert sync_stream(second, "activity_summary_1").records == 500
+    assert len(fake_stripe.report_runs) == 2
+    assert "in_flight_run" not in second.state["bookmarks"]["activity_summary_1"]
+
+
+def test_closed_windows_are_not_listed_again(fake_stripe, make_tap, sync_stream):  # noqa: ANN001, ANN201
+    """Windows that ended before they were listed in full are closed, and an incremental sync skips them."""
+    first = make_tap()
+    sync_stream(first, "balance_transactions")
+    partitions = first.state["bookmarks"]["balance_transactions"]["partitions"]
+    fake_stripe.requests.clear()
+
+    second = make_tap(state=first.state)
+    sink = sync_stream(second, "balance_transactions")
+
+    assert sum(partition.get("closed", False) for partition in partitions) == len(partitions) - 1
+    assert sink.records == 0
+    assert fake_stripe.requests["/v1/balance_transactions"] == 1
+
+
+def test_pages_are_decoded_once(make_tap, sync_stream, monkeypatch):  # noqa: ANN001, ANN201
+    """The records and the paginator share one decoding of each page."""
+    decoded = []
+    decode = requests.Response.json
+    monkeypatch.setattr(requests.Response, "json", lambda response: decoded.append(response.url) or decode(response))
+    sync_stream(make_tap(prefetch_pages=0), "charges")
+
+    assert len(decoded) == len(set(decoded)) == 3  # noqa: PLR2004
+
+
+def test_report_rows_share_one_converter(make_tap, sync_stream, monkeypatch):  # noqa: ANN001, ANN201
+    """The converter of a report run is built once, not for every row."""
+    monkeypatch.setattr("tap_stripe.client.time.sleep", lambda _: None)
+    built = []
+    row_converter = RowConverter.__init__
+    monkeypatch.setattr(RowConverter, "__init__", lambda self, **kwargs: built.append(1) or row_converter(self, **kwargs))
+
+    assert sync_stream(make_tap(), "activity_summary_1").records == 500
+    assert len(built) == 1
+
+
+def test_reports_are_parsed_in_process_on_one_cpu(make_tap, sync_stream, monkeypatch):  # noqa: ANN001, ANN201
+    """Worker processes only add overhead without a CPU to spare, so one CPU parses in the tap process."""
+    monkeypatch.setattr("tap_stripe.client.time.sleep", lambda _: None)
+    monkeypatch.setattr("os.cpu_count", lambda: 1)
+    monkeypatch.setattr("tap_stripe.reports.CHUNK_BYTES", 0)
+    parallel = []
+    monkeypatch.setattr("tap_stripe.reports.parse_parallel", lambda *args: parallel.append(args) or iter(()))
+
+    assert sync_stream(make_tap(report_parse_processes=4), "activity_summary_1").records == 500
+    assert not parallel
@@ -0,0 +1,34 @@
+"""Tests for the synthetic data generator."""
+
+from __future__ import annotations
+
+import csv
+import io
+
+import jsonschema
+import pytest
+
+from tap_stripe import schemas
+from tests.synthetic import Shape, generate_objects, report_columns, report_csv
+
+
+@pytest.mark.parametrize("stream_name", ["charges", "disputes", "payment_intents", "sources"])
+def test_objects_conform_to_schema(stream_name):  # noqa: ANN001, ANN201
+    """Generated objects validate against the stream schema and are deterministic."""
+    schema = getattr(schemas, f"{stream_name}_schema")
+    objects = list(generate_objects(stream_name, 50, shape=Shape(null_probability=0.5)))
+
+    for obj in objects:
+        jsonschema.validate(obj, schema)
+    assert len({obj["id"] for obj in objects}) == 50
+    assert objects == list(generate_objects(stream_name, 50, shape=Shape(null_probability=0.5)))
+
+
+def test_report_csv_has_report_columns():  # noqa: ANN201
+    """The report CSV header lists the report columns, excluding tap-generated ones."""
+    rows = list(csv.reader(io.StringIO(report_csv("activity_itemized_2", 10).decode())))
+
+    assert rows[0] == report_columns("activity_itemized_2")
+    assert "loaded_at" not in rows[0]
+    assert "activity_itemized_2_id" not in rows[0]
+    assert len(rows) == 11